@@ -0,0 +1,217 @@
+"""Offline bulk mapping of profiles through SkillWeave.
+
+    python -m app.bulk profiles.jsonl results.jsonl --batch-size 256 --workers 4
+    python -m app.bulk profiles.csv results.parquet
+    python -m app.bulk profiles.jsonl results.jsonl --resume
+
+Input records carry ``text`` and optional ``skills`` (a JSON list, or a
+comma-separated string in CSV) and an optional ``id``. Records are read
+lazily and analysed in batches on a thread pool, with at most two batches
+per worker in flight, so memory stays constant however large the input.
+Results are written in input order as they complete: one line per record
+for JSONL, one row group per batch for Parquet. Each output row holds the
+record's zero-based ``offset``; ``--offset N`` skips the first N records
+and ``--resume`` continues a JSONL output after its last offset.
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from app.main import analyze_items, parse_item
+from app.registry import get_engine
+from config.settings import ANALYZE_BATCH_SIZE
+
+
+def read_records(path):
+    """Yields input records as dicts, one at a time.
+
+    A JSONL line that does not parse yields a ValueError in its place, so
+    it becomes an error row at its own offset instead of ending the run.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            csv.field_size_limit(max(csv.field_size_limit(), os.path.getsize(path)))
+            for row in csv.DictReader(f):
+                skills = row.get("skills") or ""
+                row["skills"] = [s for s in skills.split(",") if s.strip()]
+                yield row
+        else:
+            for number, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield ValueError(f"Line {number} is not valid JSON: {e.msg}.")
+
+
+def last_offset(path):
+    """Offset of the last complete record in a JSONL output, or None.
+
+    A run killed mid-write leaves a partial last line; it is truncated away
+    so appended rows start on a line of their own.
+    """
+    if not os.path.exists(path):
+        return None
+    last, end = None, 0
+    with open(path, "rb+") as f:
+        for line in iter(f.readline, b""):
+            if line.strip():
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("unterminated line")
+                    last = json.loads(line)["offset"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+            end = f.tell()
+        f.truncate(end)
+    return last
+
+
+def process(engine, batch):
+    """Output rows for one batch of (offset, record) pairs."""
+    rows, items = [], []
+    for offset, record in batch:
+        row = {"offset": offset, "id": record.get("id") if isinstance(record, dict) else None}
+        try:
+            if isinstance(record, ValueError):
+                raise record
+            items.append((row, parse_item(record)))
+        except ValueError as e:
+            row["error"] = str(e)
+        rows.append(row)
+
+    outcomes = analyze_items(engine, [item for _, item in items]) if items else []
+    for (row, _), outcome in zip(items, outcomes):
+        if isinstance(outcome, Exception):
+            row["error"] = str(outcome)
+        else:
+            row["result"] = outcome
+    return rows
+
+
+class JsonlWriter:
+    def __init__(self, path, append=False):
+        self.f = open(path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, rows):
+        for row in rows:
+            self.f.write(json.dumps(row) + "\n")
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+class ParquetWriter:
+    def __init__(self, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        self.schema = pa.schema([
+            ("offset", pa.int64()),
+            ("id", pa.string()),
+            ("nco_code", pa.int64()),
+            ("title", pa.string()),
+            ("confidence", pa.float64()),
+            ("result", pa.string()),
+            ("error", pa.string()),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows):
+        best = [r["result"]["best_match"] if "result" in r else {} for r in rows]
+        self.writer.write_table(self.pa.table({
+            "offset": [r["offset"] for r in rows],
+            "id": [None if r["id"] is None else str(r["id"]) for r in rows],
+            "nco_code": [b.get("nco_code") for b in best],
+            "title": [b.get("title") for b in best],
+            "confidence": [b.get("confidence") for b in best],
+            "result": [json.dumps(r["result"]) if "result" in r else None for r in rows],
+            "error": [r.get("error") for r in rows],
+        }, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+class Progress:
+    def __init__(self, every: float = 5.0):
+        self.every = every
+        self.records = 0
+        self.errors = 0
+        self.started = self.reported = time.perf_counter()
+
+    def update(self, rows, final=False):
+        self.records += len(rows)
+        self.errors += sum("error" in r for r in rows)
+        now = time.perf_counter()
+        if final or now - self.reported >= self.every:
+            self.reported = now
+            rate = self.records / max(now - self.started, 1e-9)
+            print(f"{self.records} records ({self.errors} errors), "
+                  f"{rate:.1f} records/sec", file=sys.stderr, flush=True)
+
+
+def run(engine, records, writer, batch_size, workers, offset=0, progress=None):
+    numbered = itertools.islice(enumerate(records), offset, None)
+    batches = iter(lambda: list(itertools.islice(numbered, batch_size)), [])
+    progress = progress or Progress()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk") as pool:
+        pending = deque(
+            pool.submit(process, engine, b)
+            for b in itertools.islice(batches, workers * 2)
+        )
+        while pending:
+            rows = pending.popleft().result()
+            for batch in itertools.islice(batches, 1):
+                pending.append(pool.submit(process, engine, batch))
+            writer.write(rows)
+            progress.update(rows)
+
+    progress.update([], final=True)
+    return progress
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="JSONL or CSV file of {text, skills} records")
+    parser.add_argument("output", help="JSONL or Parquet (.parquet) results file")
+    parser.add_argument("--batch-size", type=int, default=ANALYZE_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--offset", type=int, default=0,
+                        help="skip this many input records")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue a JSONL output after its last offset")
+    parser.add_argument("--progress-every", type=float, default=5.0,
+                        help="seconds between progress lines")
+    args = parser.parse_args()
+
+    parquet = args.output.endswith(".parquet")
+    offset = args.offset
+    if args.resume:
+        if parquet:
+            parser.error("--resume needs a JSONL output; pass --offset instead.")
+        last = last_offset(args.output)
+        offset = 0 if last is None else last + 1
+
+    if parquet:
+        writer = ParquetWriter(args.output)
+    else:
+        writer = JsonlWriter(args.output, append=args.resume or offset > 0)
+
+    try:
+        run(get_engine(), read_records(args.input), writer,
+            args.batch_size, args.workers, offset, Progress(args.progress_every))
+    finally:
+        writer.close()
+
+
+if __name__ == "__main__":
+    main()
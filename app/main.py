@@ -1,29 +1,72 @@
+import threading
 from intelligence.nco_matcher import NCOMatcher
 from intelligence.skill_gap import SkillGapEngine
 from intelligence.career_graph import CareerGraph
 from core.explainability import Explainability
+from core.tracing import trace, span
 from utils.validators import validate_text, validate_skills
+from config.settings import (
+    ANALYZE_BATCH_SIZE, NCO_PATH, SKILLS_PATH, TRANSITIONS_PATH, TRACE_BREAKDOWN
+)
 
 class SkillWeave:
-    def __init__(self):
-        self.matcher = NCOMatcher()
-        self.skills = SkillGapEngine()
-        self.graph = CareerGraph()
+    """Sub-components are built on first use, each at most once, thread-safely."""
 
-    def analyze(self, text, user_skills):
-        validate_text(text)
-        user_skills = validate_skills(user_skills)
+    def __init__(self, nco_path=NCO_PATH, skills_path=SKILLS_PATH,
+                 transitions_path=TRANSITIONS_PATH, cache_dir=None):
+        self.nco_path = nco_path
+        self.skills_path = skills_path
+        self.transitions_path = transitions_path
+        self.cache_dir = cache_dir
+        self._components = {}
+        self._locks = {
+            name: threading.Lock() for name in ("matcher", "skills", "graph")
+        }
 
-        matches = self.matcher.match(text)
+    def _component(self, name, factory):
+        component = self._components.get(name)
+        if component is None:
+            with self._locks[name]:
+                component = self._components.get(name)
+                if component is None:
+                    component = factory()
+                    self._components[name] = component
+        return component
 
-        if not matches:
-            raise RuntimeError("No matching NCO roles found.")
+    @property
+    def matcher(self):
+        return self._component(
+            "matcher", lambda: NCOMatcher(self.nco_path, self.cache_dir)
+        )
 
-        best = matches[0]
+    @property
+    def skills(self):
+        return self._component("skills", lambda: SkillGapEngine(self.skills_path))
+
+    @property
+    def graph(self):
+        return self._component(
+            "graph",
+            lambda: CareerGraph(skills=self.skills, path=self.transitions_path)
+        )
 
-        gap = self.skills.gap(user_skills, best["nco_code"])
-        transitions = self.graph.next_roles(best["nco_code"])
+    @property
+    def stats(self):
+        """Counters of the components built so far."""
+        matcher = self._components.get("matcher")
+        return {} if matcher is None else {"matcher": dict(matcher.stats)}
 
+    @property
+    def ready(self):
+        return len(self._components) == len(self._locks)
+
+    def warm_up(self):
+        self.skills, self.graph, self.matcher.embedder.model
+        return self
+
+    @staticmethod
+    def _result(matches, gap, transitions):
+        best = matches[0]
         return {
         "best_match": best,
         "related_roles": matches[1:],
@@ -36,3 +79,103 @@ class SkillWeave:
             "skills": Explainability.skills(gap)
         }
     }
+
+    def analyze(self, text, user_skills):
+        with trace("analyze") as t:
+            with span("validate"):
+                validate_text(text)
+                user_skills = validate_skills(user_skills)
+
+            with span("match"):
+                matches = self.matcher.match(text)
+
+            if not matches:
+                raise RuntimeError("No matching NCO roles found.")
+
+            best = matches[0]
+
+            with span("gap"):
+                gap = self.skills.gap(user_skills, best["nco_code"])
+            with span("graph"):
+                transitions = self.graph.next_roles(best["nco_code"])
+
+            with span("explain"):
+                result = self._result(matches, gap, transitions)
+
+        timings = t.breakdown()
+        if TRACE_BREAKDOWN and timings:
+            result["timings"] = timings
+        return result
+
+    def analyze_many(self, texts, skills_list=None, batch_size=ANALYZE_BATCH_SIZE):
+        """Batched ``analyze``; results come back in input order.
+
+        Texts without a match above MIN_CONFIDENCE get None instead of
+        failing the whole batch.
+        """
+        texts = list(texts)
+        if skills_list is None:
+            skills_list = [None] * len(texts)
+        skills_list = list(skills_list)
+        if len(skills_list) != len(texts):
+            raise ValueError("texts and skills_list must have the same length.")
+
+        with trace("analyze_many"):
+            with span("validate"):
+                for text in texts:
+                    validate_text(text)
+                skills_list = [validate_skills(s) for s in skills_list]
+
+            results = []
+            for start in range(0, len(texts), batch_size):
+                batch = texts[start:start + batch_size]
+                batch_skills = skills_list[start:start + batch_size]
+
+                with span("match"):
+                    all_matches = self.matcher.match_many(batch, batch_size=batch_size)
+
+                # Only confidently matched texts go on to gap and graph work.
+                found = [j for j, m in enumerate(all_matches) if m]
+                codes = [all_matches[j][0]["nco_code"] for j in found]
+                with span("gap"):
+                    gaps = self.skills.gap_many([batch_skills[j] for j in found], codes)
+                with span("graph"):
+                    transitions = {c: self.graph.next_roles(c) for c in set(codes)}
+
+                with span("explain"):
+                    batch_results = [None] * len(batch)
+                    for j, g, c in zip(found, gaps, codes):
+                        batch_results[j] = self._result(
+                            all_matches[j], g, list(transitions[c])
+                        )
+                    results.extend(batch_results)
+
+        return results
+
+
+def analyze_items(engine, items):
+    """Analyses (text, skills) items as one batch; failures stay with their item."""
+    try:
+        results = engine.analyze_many(
+            [text for text, _ in items], [skills for _, skills in items]
+        )
+        return [
+            RuntimeError("No matching NCO roles found.") if r is None else r
+            for r in results
+        ]
+    except Exception:
+        outcomes = []
+        for text, skills in items:
+            try:
+                outcomes.append(engine.analyze(text, skills))
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+
+
+def parse_item(payload):
+    if not isinstance(payload, dict):
+        raise ValueError("Each request must be a JSON object.")
+    text = payload.get("text")
+    validate_text(text)
+    return text, validate_skills(payload.get("skills"))
@@ -0,0 +1,33 @@
+"""Process-wide SkillWeave instance.
+
+Streamlit re-executes the dashboard script on every interaction and for
+every session, but imported modules persist, so the engine kept here is
+built once per process and shared by all sessions and reruns.
+"""
+import threading
+from app.main import SkillWeave
+
+_engine = None
+_warm_thread = None
+_lock = threading.Lock()
+
+
+def get_engine() -> SkillWeave:
+    global _engine
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                _engine = SkillWeave()
+    return _engine
+
+
+def warm_up() -> threading.Thread:
+    """Loads the engine's components on a daemon thread, once per process."""
+    global _warm_thread
+    with _lock:
+        if _warm_thread is None:
+            _warm_thread = threading.Thread(
+                target=get_engine().warm_up, name="skillweave-warm-up", daemon=True
+            )
+            _warm_thread.start()
+    return _warm_thread
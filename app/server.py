@@ -0,0 +1,249 @@
+"""Asyncio HTTP front end for SkillWeave with request micro-batching.
+
+    python -m app.server --port 8080
+
+    POST /analyze        {"text": "...", "skills": ["Python", "Git"]}
+    POST /analyze/batch  {"items": [{"text": "...", "skills": [...]}, ...]}
+    GET  /health
+    GET  /metrics        Prometheus stage histograms (run with --trace)
+
+Concurrent requests are coalesced into batches of up to
+SERVER_MAX_BATCH_SIZE items, waiting at most SERVER_MAX_WAIT_MS for a batch
+to fill, and run through SkillWeave.analyze_many on a single inference
+thread so the event loop never blocks on the model or FAISS.
+"""
+import argparse
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from app.main import analyze_items, parse_item
+from app.registry import get_engine, warm_up
+from core import tracing
+from config.settings import (
+    SERVER_HOST, SERVER_PORT, SERVER_MAX_BATCH_SIZE, SERVER_MAX_WAIT_MS
+)
+
+MAX_BODY_BYTES = 1 << 20
+
+
+class MicroBatcher:
+    def __init__(self, fn, max_batch_size: int, max_wait_ms: float, executor):
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor
+        self.queue = asyncio.Queue()
+        self.stats = {"requests": 0, "batches": 0}
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+
+    async def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((item, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+            self.stats["requests"] += len(items)
+            self.stats["batches"] += 1
+
+            try:
+                outcomes = await loop.run_in_executor(self.executor, self.fn, items)
+            except Exception as e:
+                outcomes = [e] * len(items)
+            for (_, future), outcome in zip(batch, outcomes):
+                if future.done():
+                    continue
+                if isinstance(outcome, Exception):
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(outcome)
+
+
+def error_status(e: Exception) -> HTTPStatus:
+    if isinstance(e, ValueError):
+        return HTTPStatus.BAD_REQUEST
+    if isinstance(e, RuntimeError):
+        return HTTPStatus.UNPROCESSABLE_ENTITY
+    return HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+class AnalyzeServer:
+    def __init__(self, engine, max_batch_size=SERVER_MAX_BATCH_SIZE,
+                 max_wait_ms=SERVER_MAX_WAIT_MS):
+        self.engine = engine
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+        self.batcher = MicroBatcher(
+            lambda items: analyze_items(engine, items),
+            max_batch_size, max_wait_ms, self.executor
+        )
+
+    async def analyze(self, body):
+        return await self.batcher.submit(parse_item(body))
+
+    async def analyze_batch(self, body):
+        if not isinstance(body, dict) or not isinstance(body.get("items"), list):
+            raise ValueError("Batch requests need an 'items' list.")
+        # Invalid items fail on their own, like items whose analysis fails.
+        outcomes = await asyncio.gather(
+            *(self.analyze(payload) for payload in body["items"]),
+            return_exceptions=True
+        )
+        return {"results": [
+            {"error": str(o), "status": int(error_status(o))}
+            if isinstance(o, Exception) else o
+            for o in outcomes
+        ]}
+
+    async def route(self, method, path, body):
+        if method == "GET" and path == "/health":
+            return HTTPStatus.OK, {
+                "status": "ok", **self.batcher.stats, **self.engine.stats
+            }
+        if method == "GET" and path == "/metrics":
+            return HTTPStatus.OK, tracing.metrics_text() + tracing.counters_text(
+                self.engine.stats.get("matcher", {}), "skillweave_matcher"
+            )
+        if method == "POST" and path == "/analyze":
+            return HTTPStatus.OK, await self.analyze(body)
+        if method == "POST" and path == "/analyze/batch":
+            return HTTPStatus.OK, await self.analyze_batch(body)
+        return HTTPStatus.NOT_FOUND, {"error": f"No route for {method} {path}."}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # Without a usable length the body cannot be framed, so
+                    # the connection is closed after the reply.
+                    status, payload = HTTPStatus.BAD_REQUEST, {
+                        "error": "Invalid Content-Length header."
+                    }
+                    keep_alive = False
+                elif length > MAX_BODY_BYTES:
+                    status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {
+                        "error": "Request body too large."
+                    }
+                    keep_alive = False
+                else:
+                    raw = await reader.readexactly(length) if length else b""
+                    status, payload = await self.respond(method, target, raw)
+                    keep_alive = (
+                        headers.get("connection", "").lower() != "close"
+                        and version != "HTTP/1.0"
+                    )
+
+                if isinstance(payload, str):
+                    data = payload.encode("utf-8")
+                    content_type = "text/plain; version=0.0.4"
+                else:
+                    data = json.dumps(payload).encode("utf-8")
+                    content_type = "application/json"
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                    f"\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, method, target, raw):
+        path = target.split("?", 1)[0]
+        try:
+            body = json.loads(raw) if raw else None
+        except json.JSONDecodeError:
+            return HTTPStatus.BAD_REQUEST, {"error": "Body must be valid JSON."}
+
+        try:
+            return await self.route(method, path, body)
+        except Exception as e:
+            return error_status(e), {"error": str(e)}
+
+    async def serve(self, host, port):
+        self.batcher.start()
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"SkillWeave listening on http://{host}:{port}")
+        async with server:
+            try:
+                await server.serve_forever()
+            finally:
+                await self.batcher.stop()
+                self.executor.shutdown(wait=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SkillWeave HTTP inference service")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--max-batch-size", type=int, default=SERVER_MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=SERVER_MAX_WAIT_MS)
+    parser.add_argument("--trace", action="store_true",
+                        help="record per-stage spans for /metrics")
+    args = parser.parse_args()
+
+    if args.trace:
+        tracing.enable()
+
+    warm_up()
+    server = AnalyzeServer(get_engine(), args.max_batch_size, args.max_wait_ms)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,90 @@
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"
 TOP_K = 5
+# Matches scoring below this are dropped before skill-gap and graph work.
 MIN_CONFIDENCE = 0.45
+
+# torch (sentence-transformers), onnx or onnx-int8. The ONNX backends need
+# onnxruntime and onnx; the model is exported to ONNX_DIR on first use.
+EMBEDDING_BACKEND = "torch"
+ONNX_DIR = "cache/onnx"
+# Inference threads per process; None leaves the runtime default.
+EMBEDDING_THREADS = None
+
+NCO_PATH = "data/nco.csv"
+SKILLS_PATH = "data/skills.csv"
+
+EMBEDDING_CACHE_DIR = "cache/embeddings"
+INDEX_DIR = "cache/index"
+# Memory-mapped columnar copies of data/nco.csv, rebuilt when it changes.
+CATALOG_DIR = "cache/catalog"
+
+# One of core.vector_index.BACKENDS: flat, ivf_flat, ivf_sq8, hnsw, ivf_pq.
+INDEX_BACKEND = "flat"
+INDEX_NLIST = 1024
+INDEX_NPROBE = 16
+INDEX_HNSW_M = 32
+INDEX_EF_CONSTRUCTION = 40
+INDEX_EF_SEARCH = 64
+INDEX_PQ_M = 16
+INDEX_PQ_NBITS = 8
+
+ANALYZE_BATCH_SIZE = 256
+
+PATH_CACHE_SIZE = 1024
+# Edge cost per transition reason for CareerGraph.paths(weight="reason");
+# reasons not listed cost 1.0.
+TRANSITION_REASON_WEIGHTS = {}
+# CSV or Parquet with from_nco, to_nco, reason columns.
+TRANSITIONS_PATH = "data/transitions.csv"
+
+QUERY_CACHE_SIZE = 4096
+# Seconds before a cached query vector is re-encoded; None keeps it forever.
+QUERY_CACHE_TTL = None
+# SQLite file shared by all processes on the host, e.g. "cache/queries.sqlite".
+QUERY_CACHE_PATH = None
+# Rows kept in that file; the oldest are deleted past this, and expired
+# ones dropped, every few hundred writes. None leaves it unbounded.
+QUERY_CACHE_SHARED_SIZE = 100000
+
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8080
+SERVER_MAX_BATCH_SIZE = 32
+SERVER_MAX_WAIT_MS = 5
+
+# Cold-start budget for `import app.main`, checked by evaluation/startup_profile.py.
+STARTUP_BUDGET_MS = 400
+
+# dense: FAISS only. hybrid: BM25 and FAISS candidates fused (HYBRID_FUSION),
+# which reorders best_match away from the highest-cosine row; compare with
+# `python -m evaluation.quality --retrieval dense hybrid:rrf hybrid:weighted`.
+RETRIEVAL_MODE = "dense"
+# rrf (reciprocal rank fusion) or weighted (HYBRID_ALPHA * cosine +
+# (1 - HYBRID_ALPHA) * BM25 scaled to the best lexical hit).
+HYBRID_FUSION = "rrf"
+HYBRID_ALPHA = 0.7
+HYBRID_CANDIDATES = 4 * TOP_K
+RRF_K = 60
+
+# Inputs longer than CHUNK_THRESHOLD_WORDS (about MiniLM's 256-token limit)
+# are split into sentence windows of CHUNK_WORDS, searched together and
+# pooled per occupation: max, or mean of the CHUNK_TOP_N best chunks.
+CHUNKING = True
+CHUNK_THRESHOLD_WORDS = 180
+CHUNK_WORDS = 96
+CHUNK_OVERLAP_SENTENCES = 1
+CHUNK_AGGREGATION = "max"
+CHUNK_TOP_N = 3
+
+# Per-stage spans in SkillWeave.analyze, exported as Prometheus histograms
+# at /metrics. Off, each span costs one flag check.
+TRACING_ENABLED = False
+# Adds a "timings" dict (ms per stage) to analyze() results while tracing.
+TRACE_BREAKDOWN = False
+# Fraction of traced requests run under PROFILER (cprofile or pyinstrument);
+# profiles of those slower than PROFILE_SLOW_MS are kept in PROFILE_DIR.
+PROFILE_SAMPLE_RATE = 0.0
+PROFILE_SLOW_MS = 500
+PROFILER = "cprofile"
+PROFILE_DIR = "cache/profiles"
+# Port for a standalone /metrics endpoint in the dashboard; None disables it.
+METRICS_PORT = None
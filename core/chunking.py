@@ -0,0 +1,51 @@
+import re
+import numpy as np
+
+# Sentence ends, semicolons and line breaks (resume bullets rarely end
+# with a full stop).
+SENTENCE_RE = re.compile(r"(?<=[.!?;])\s+|\s*\n+\s*")
+AGGREGATIONS = ("max", "mean")
+
+
+def sentences(text: str):
+    return [s for s in SENTENCE_RE.split(text) if s.strip()]
+
+
+def chunk_text(text: str, max_words: int = 96, overlap: int = 1):
+    """Windows of whole sentences of up to ``max_words`` words.
+
+    Consecutive windows share their last ``overlap`` sentences so a match
+    spanning a boundary is seen whole once. Sentences longer than a window
+    are cut into word runs.
+    """
+    units = []
+    for sentence in sentences(text):
+        words = sentence.split()
+        for start in range(0, len(words), max_words):
+            units.append(words[start:start + max_words])
+
+    chunks, window, size = [], [], 0
+    for words in units:
+        if window and size + len(words) > max_words:
+            chunks.append(" ".join(w for s in window for w in s))
+            window = window[len(window) - overlap:] if overlap else []
+            size = sum(len(s) for s in window)
+            # The overlap alone may not leave room for the next sentence.
+            while window and size + len(words) > max_words:
+                size -= len(window.pop(0))
+        window.append(words)
+        size += len(words)
+
+    if window:
+        chunks.append(" ".join(w for s in window for w in s))
+    return chunks or [text]
+
+
+def aggregate(sims: np.ndarray, how: str = "max", top_n: int = 3) -> np.ndarray:
+    """Pools a (candidates, chunks) similarity matrix into one score per candidate."""
+    if how not in AGGREGATIONS:
+        raise ValueError(f"Unknown chunk aggregation '{how}'.")
+    if how == "max" or sims.shape[1] == 1:
+        return sims.max(axis=1)
+    n = min(top_n, sims.shape[1])
+    return -np.partition(-sims, n - 1, axis=1)[:, :n].mean(axis=1)
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import numpy as np
+
+
+class EmbeddingCache:
+    """Content-addressed store of corpus embeddings.
+
+    Vectors live in a memory-mappable ``<model>.npy`` file; the sidecar
+    ``<model>.keys`` holds one sha1 key (model name + text) per row. Each
+    rewrite keeps the rows of the corpus being encoded and at most
+    ``max_stale`` of the newest other rows, so edits to the corpus do not
+    grow the file without bound.
+    """
+
+    def __init__(self, directory: str, model_name: str, max_stale: int = 10000):
+        self.model_name = model_name
+        self.max_stale = max_stale
+        stem = os.path.join(directory, model_name.replace("/", "__"))
+        self.vectors_path = stem + ".npy"
+        self.keys_path = stem + ".keys"
+        self._load()
+
+    def key(self, text: str) -> str:
+        payload = f"{self.model_name}\0{text}".encode("utf-8")
+        return hashlib.sha1(payload).hexdigest()
+
+    def digest(self, texts) -> str:
+        h = hashlib.sha1()
+        for text in texts:
+            h.update(self.key(text).encode("ascii"))
+        return h.hexdigest()[:16]
+
+    def _load(self):
+        self.vectors = None
+        self.rows = {}
+        if not (os.path.exists(self.vectors_path) and os.path.exists(self.keys_path)):
+            return
+
+        vectors = np.load(self.vectors_path, mmap_mode="r")
+        with open(self.keys_path, encoding="ascii") as f:
+            keys = f.read().split()
+
+        # A crash between the two writes leaves them out of step; start over.
+        if len(keys) != len(vectors):
+            return
+
+        self.vectors = vectors
+        self.rows = {k: i for i, k in enumerate(keys)}
+
+    def _append(self, keys, vectors: np.ndarray, live):
+        if self.vectors is not None:
+            # Rows are in write order, so the last stale keys are the newest.
+            stale = [k for k in self.rows if k not in live]
+            dropped = set(stale[:max(0, len(stale) - self.max_stale)])
+            kept = [k for k in self.rows if k not in dropped]
+            rows = np.fromiter((self.rows[k] for k in kept), dtype=np.int64,
+                               count=len(kept))
+            vectors = np.concatenate([self.vectors[rows], vectors])
+            keys = kept + keys
+
+        os.makedirs(os.path.dirname(self.vectors_path), exist_ok=True)
+        tmp = f"{self.vectors_path}.{os.getpid()}.tmp.npy"
+        np.save(tmp, vectors.astype("float32"))
+        os.replace(tmp, self.vectors_path)
+
+        tmp = f"{self.keys_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="ascii") as f:
+            f.write("\n".join(keys))
+        os.replace(tmp, self.keys_path)
+
+        self._load()
+
+    def encode(self, embedder, texts) -> np.ndarray:
+        keys = [self.key(t) for t in texts]
+
+        missing = {}
+        for k, text in zip(keys, texts):
+            if k not in self.rows and k not in missing:
+                missing[k] = text
+
+        if missing:
+            fresh = embedder.encode(list(missing.values()))
+            self._append(list(missing), fresh, set(keys))
+
+        rows = np.fromiter(
+            (self.rows[k] for k in keys), dtype=np.int64, count=len(keys)
+        )
+        return np.ascontiguousarray(self.vectors[rows], dtype="float32")
@@ -1,13 +1,204 @@
-from sentence_transformers import SentenceTransformer
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
 import numpy as np
+from core.tracing import span
+
+
+def normalize_query(text: str) -> str:
+    # all-MiniLM-L6-v2 uses an uncased tokenizer, so case and spacing
+    # variants of a query map to the same embedding.
+    return " ".join(unicodedata.normalize("NFKC", text).lower().split())
+
+
+class QueryCache:
+    """Bounded LRU of query vectors with optional TTL.
+
+    With ``path`` set, misses fall through to a SQLite file that other
+    processes on the host read and fill as well. Every ``purge_every``
+    writes, that file drops expired rows and then its oldest rows past
+    ``shared_maxsize``.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = None, path: str = None,
+                 shared_maxsize: int = None, purge_every: int = 256):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.shared_maxsize = shared_maxsize
+        self.purge_every = purge_every
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0,
+                      "shared_hits": 0, "purged": 0}
+        self._entries = OrderedDict()
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _db(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS query_vectors "
+                "(key TEXT PRIMARY KEY, created REAL, dim INTEGER, vec BLOB)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS query_vectors_created "
+                "ON query_vectors (created)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def _fresh(self, created: float) -> bool:
+        return self.ttl is None or time.time() - created <= self.ttl
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created, vec = entry
+                if self._fresh(created):
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return vec
+                del self._entries[key]
+                self.stats["expired"] += 1
+
+        if self.path:
+            row = self._db().execute(
+                "SELECT created, dim, vec FROM query_vectors WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self._fresh(row[0]):
+                vec = np.frombuffer(row[2], dtype="float32").reshape(row[1])
+                self._remember(key, vec, row[0])
+                with self._lock:
+                    self.stats["hits"] += 1
+                    self.stats["shared_hits"] += 1
+                return vec
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def _remember(self, key, vec, created):
+        with self._lock:
+            self._entries[key] = (created, vec)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def put(self, key: str, vec: np.ndarray):
+        created = time.time()
+        vec = np.ascontiguousarray(vec, dtype="float32")
+        vec.setflags(write=False)
+        self._remember(key, vec, created)
+
+        if self.path:
+            with self._lock:
+                self._writes += 1
+                purge = self._writes % self.purge_every == 0
+            with self._db() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO query_vectors VALUES (?, ?, ?, ?)",
+                    (key, created, vec.shape[0], vec.tobytes())
+                )
+                if purge:
+                    self._purge(conn)
+
+    def _purge(self, conn):
+        deleted = 0
+        if self.ttl is not None:
+            deleted += conn.execute(
+                "DELETE FROM query_vectors WHERE created < ?",
+                (time.time() - self.ttl,)
+            ).rowcount
+        if self.shared_maxsize is not None:
+            deleted += conn.execute(
+                "DELETE FROM query_vectors WHERE key IN (SELECT key FROM "
+                "query_vectors ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                (self.shared_maxsize,)
+            ).rowcount
+        with self._lock:
+            self.stats["purged"] += deleted
+
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
 
 class EmbeddingEngine:
-    def __init__(self, model_name: str):
-        self.model = SentenceTransformer(model_name)
+    def __init__(self, model_name: str, query_cache: QueryCache = None,
+                 backend: str = "torch", onnx_dir: str = None, threads: int = None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown embedding backend '{backend}'.")
+        self.model_name = model_name
+        self.backend = backend
+        self.onnx_dir = onnx_dir
+        self.threads = threads
+        # Vectors differ slightly per backend, so caches key on this name.
+        self.name = model_name if backend == "torch" else f"{model_name}@{backend}"
+        self.query_cache = query_cache
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        # Loaded on first encode: with the corpus cache and index on disk,
+        # startup never needs torch or the model weights.
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self._model
+
+    def _load_model(self):
+        if self.backend == "torch":
+            from sentence_transformers import SentenceTransformer
+            if self.threads:
+                import torch
+                torch.set_num_threads(self.threads)
+            return SentenceTransformer(self.model_name)
 
-    def encode(self, texts):
-        embeddings = self.model.encode(
-            texts,
-            normalize_embeddings=True
+        from core.onnx_encoder import OnnxEncoder
+        return OnnxEncoder(
+            self.model_name, self.onnx_dir,
+            int8=self.backend == "onnx-int8", threads=self.threads
         )
+
+    def encode(self, texts, batch_size: int = 32):
+        with span("encode.model"):
+            embeddings = self.model.encode(
+                texts,
+                batch_size=batch_size,
+                normalize_embeddings=True
+            )
         return embeddings.astype("float32")
+
+    def encode_queries(self, texts, batch_size: int = 32):
+        """``encode`` for user queries, served from the query cache when set."""
+        if self.query_cache is None:
+            return self.encode(texts, batch_size=batch_size)
+
+        with span("encode.cache"):
+            normalized = [normalize_query(t) for t in texts]
+            keys = [f"{self.name}\0{t}" for t in normalized]
+            # Repeats within the batch are looked up, and counted, once.
+            found = {k: self.query_cache.get(k) for k in dict.fromkeys(keys)}
+            vectors = [found[k] for k in keys]
+
+        missing = {}
+        for i, vec in enumerate(vectors):
+            if vec is None:
+                missing.setdefault(normalized[i], []).append(i)
+
+        if missing:
+            fresh = self.encode(list(missing), batch_size=batch_size)
+            for vec, positions in zip(fresh, missing.values()):
+                self.query_cache.put(keys[positions[0]], vec)
+                for i in positions:
+                    vectors[i] = vec
+
+        return np.stack(vectors)
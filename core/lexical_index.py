@@ -0,0 +1,70 @@
+import re
+import numpy as np
+from core.tracing import span
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str):
+    return TOKEN_RE.findall(text.lower())
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed corpus with array-backed postings.
+
+    Postings are stored CSR-style per term (``indptr``/``docs``) with the
+    BM25 term weight precomputed, so a query is a handful of slice adds.
+    """
+
+    def __init__(self, corpus, k1: float = 1.2, b: float = 0.75):
+        self.vocab = {}
+        term_ids, doc_ids = [], []
+        n = len(corpus)
+        lengths = np.zeros(n, dtype=np.float32)
+
+        for d, text in enumerate(corpus):
+            tokens = tokenize(text)
+            lengths[d] = len(tokens)
+            term_ids.extend(self.vocab.setdefault(t, len(self.vocab)) for t in tokens)
+            doc_ids.extend([d] * len(tokens))
+
+        self.n_docs = n
+        pair = np.asarray(term_ids, dtype=np.int64) * max(n, 1) + np.asarray(doc_ids, dtype=np.int64)
+        pair, tf = np.unique(pair, return_counts=True)
+        terms, docs = pair // max(n, 1), pair % max(n, 1)
+
+        df = np.bincount(terms, minlength=len(self.vocab))
+        self.indptr = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+        np.cumsum(df, out=self.indptr[1:])
+        self.docs = docs.astype(np.int32)
+        self.idf = np.log1p((n - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+        dl = lengths[docs] / max(float(lengths.mean()) if n else 0.0, 1e-9)
+        tf = tf.astype(np.float32)
+        self.weights = (
+            self.idf[terms] * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl))
+        ).astype(np.float32)
+
+    def term_ids(self, text: str):
+        ids = {self.vocab.get(t) for t in tokenize(text)}
+        ids.discard(None)
+        return sorted(ids)
+
+    def scores(self, text: str) -> np.ndarray:
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        for t in self.term_ids(text):
+            start, end = self.indptr[t], self.indptr[t + 1]
+            scores[self.docs[start:end]] += self.weights[start:end]
+        return scores
+
+    def search(self, text: str, top_k: int, ids=None):
+        with span("lexical.search"):
+            scores = self.scores(text)
+            if ids is None:
+                hits = np.flatnonzero(scores)
+            else:
+                hits = ids[scores[ids] > 0]
+            if len(hits) > top_k:
+                hits = hits[np.argpartition(-scores[hits], top_k - 1)[:top_k]]
+            hits = hits[np.argsort(-scores[hits], kind="stable")]
+            return scores[hits], hits
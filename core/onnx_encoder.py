@@ -0,0 +1,149 @@
+import json
+import os
+import numpy as np
+
+POOLING_MODES = ("mean", "cls", "max")
+
+
+def export(model_name: str, directory: str):
+    """Exports a SentenceTransformer's transformer to ``model.onnx``.
+
+    The tokenizer and the pooling setup are saved next to it so inference
+    only needs onnxruntime and the tokenizer afterwards.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    st = SentenceTransformer(model_name, device="cpu")
+    # Only the transformer is exported and pooling and normalisation are
+    # redone in numpy; any other module (Dense, ...) would be dropped.
+    modules = [type(m).__name__ for m in st]
+    if (len(modules) < 2 or modules[1] != "Pooling"
+            or any(name != "Normalize" for name in modules[2:])):
+        raise ValueError(
+            f"Model modules {modules} are not supported by the ONNX backend; "
+            "only Transformer, Pooling and an optional Normalize are."
+        )
+    transformer, pooling = st[0], st[1]
+    # sentence-transformers 6 exposes the mode directly; older releases
+    # only through get_pooling_mode_str().
+    mode = getattr(pooling, "pooling_mode", None) or pooling.get_pooling_mode_str()
+    if mode not in POOLING_MODES:
+        raise ValueError(f"Pooling mode '{mode}' is not supported by the ONNX backend.")
+
+    class LastHiddenState(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(*inputs, return_dict=False)[0]
+
+    tokenizer = transformer.tokenizer
+    dummy = tokenizer(["an occupation description"], return_tensors="pt")
+    input_names = [
+        n for n in ("input_ids", "attention_mask", "token_type_ids") if n in dummy
+    ]
+    axes = {n: {0: "batch", 1: "sequence"} for n in input_names}
+    axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    os.makedirs(directory, exist_ok=True)
+    tmp = os.path.join(directory, f"model.onnx.{os.getpid()}.tmp")
+    with torch.no_grad():
+        torch.onnx.export(
+            LastHiddenState(transformer.auto_model.eval()),
+            tuple(dummy[n] for n in input_names),
+            tmp,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=axes,
+            opset_version=14,
+            dynamo=False,
+        )
+    tokenizer.save_pretrained(directory)
+    with open(os.path.join(directory, "pooling.json"), "w") as f:
+        json.dump({"pooling": mode, "max_seq_length": st.max_seq_length}, f)
+    os.replace(tmp, os.path.join(directory, "model.onnx"))
+
+
+def quantize(directory: str):
+    """Writes ``model.int8.onnx``: int8 weights, dynamic activation scales."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    tmp = os.path.join(directory, f"model.int8.onnx.{os.getpid()}.tmp")
+    quantize_dynamic(
+        os.path.join(directory, "model.onnx"), tmp, weight_type=QuantType.QInt8
+    )
+    os.replace(tmp, os.path.join(directory, "model.int8.onnx"))
+
+
+class OnnxEncoder:
+    """onnxruntime drop-in for ``SentenceTransformer.encode``.
+
+    Tokenization, pooling and normalization follow the exported model, so
+    vectors match the torch path up to numerical drift.
+    """
+
+    def __init__(self, model_name: str, directory: str, int8: bool = False,
+                 threads: int = None):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        directory = os.path.join(directory, model_name.replace("/", "__"))
+        if not os.path.exists(os.path.join(directory, "model.onnx")):
+            export(model_name, directory)
+        filename = "model.onnx"
+        if int8:
+            filename = "model.int8.onnx"
+            if not os.path.exists(os.path.join(directory, filename)):
+                quantize(directory)
+
+        with open(os.path.join(directory, "pooling.json")) as f:
+            config = json.load(f)
+        self.pooling = config["pooling"]
+        self.max_seq_length = config["max_seq_length"]
+        self.tokenizer = AutoTokenizer.from_pretrained(directory)
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(
+            os.path.join(directory, filename), options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _pool(self, hidden, mask):
+        if self.pooling == "cls":
+            return hidden[:, 0]
+        mask = mask[..., None].astype("float32")
+        if self.pooling == "max":
+            return np.where(mask > 0, hidden, -1e9).max(axis=1)
+        return (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    def encode(self, texts, batch_size: int = 32, normalize_embeddings: bool = True):
+        if isinstance(texts, str):
+            texts = [texts]
+
+        chunks = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                list(texts[start:start + batch_size]),
+                padding=True, truncation=True,
+                max_length=self.max_seq_length, return_tensors="np"
+            )
+            feeds = {
+                k: v.astype(np.int64) for k, v in encoded.items()
+                if k in self.input_names
+            }
+            hidden = self.session.run(None, feeds)[0]
+            chunks.append(self._pool(hidden, encoded["attention_mask"]))
+
+        if not chunks:
+            return np.zeros((0, 0), dtype="float32")
+
+        vectors = np.concatenate(chunks).astype("float32")
+        if normalize_embeddings:
+            vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+        return vectors
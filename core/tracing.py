@@ -0,0 +1,251 @@
+"""Per-stage latency spans for the analyze path.
+
+    with trace("analyze") as t:
+        with span("match"):
+            ...
+    t.breakdown()  # {"match": 12.3, "analyze": 14.1} in ms
+
+Spans attach to the trace active in the current context and are summed
+per name. Finished traces feed process-wide histograms exported in the
+Prometheus text format by ``metrics_text`` and ``serve_metrics``. While
+tracing is off, ``trace`` and ``span`` return a shared no-op after one
+flag check. A sampled fraction of traces can run under a profiler; the
+profiles of traces slower than PROFILE_SLOW_MS are written to PROFILE_DIR.
+"""
+import bisect
+import contextvars
+import os
+import random
+import threading
+import time
+
+from utils.paths import resolve
+from config.settings import (
+    TRACING_ENABLED, PROFILE_SAMPLE_RATE, PROFILE_SLOW_MS, PROFILER, PROFILE_DIR
+)
+
+# Upper bounds in seconds, as Prometheus expects.
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+           0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_enabled = TRACING_ENABLED
+_current = contextvars.ContextVar("skillweave_trace", default=None)
+
+
+def enable(flag: bool = True):
+    global _enabled
+    _enabled = flag
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+class _NoOp:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def breakdown(self):
+        return None
+
+
+NOOP = _NoOp()
+
+
+class Histograms:
+    """Cumulative latency histograms keyed by stage name."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            counts, total = self._stages.get(stage, (None, 0.0))
+            if counts is None:
+                counts = [0] * (len(self.buckets) + 1)
+            counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self._stages[stage] = (counts, total + seconds)
+
+    def text(self, name: str = "skillweave_stage_seconds") -> str:
+        lines = [
+            f"# HELP {name} Latency of SkillWeave stages.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            stages = sorted((k, list(c), t) for k, (c, t) in self._stages.items())
+        for stage, counts, total in stages:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {total}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {cumulative}')
+        return "\n".join(lines) + "\n"
+
+
+histograms = Histograms()
+stats = {"traces": 0, "profiled": 0, "profiles_saved": 0}
+
+
+class Span:
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _Profile:
+    """cProfile or pyinstrument around one trace."""
+
+    def __init__(self):
+        self.kind = PROFILER
+        if self.kind == "pyinstrument":
+            from pyinstrument import Profiler
+            self.profiler = Profiler()
+            self.profiler.start()
+        else:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            # Only one cProfile may run per interpreter on 3.12+.
+            self.profiler.enable()
+
+    def stop(self):
+        if self.kind == "pyinstrument":
+            self.profiler.stop()
+        else:
+            self.profiler.disable()
+
+    def save(self, stem: str):
+        directory = resolve(PROFILE_DIR)
+        os.makedirs(directory, exist_ok=True)
+        if self.kind == "pyinstrument":
+            path = os.path.join(directory, stem + ".html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.profiler.output_html())
+        else:
+            path = os.path.join(directory, stem + ".prof")
+            self.profiler.dump_stats(path)
+        return path
+
+
+class Trace:
+    def __init__(self, name: str):
+        self.name = name
+        self.stages = {}
+        self.seconds = None
+        self.profile = None
+
+    def add(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def __enter__(self):
+        if PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE:
+            try:
+                self.profile = _Profile()
+            except (ImportError, ValueError):
+                self.profile = None
+        self._token = _current.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self.start
+        _current.reset(self._token)
+
+        histograms.observe(self.name, self.seconds)
+        for name, seconds in self.stages.items():
+            histograms.observe(name, seconds)
+        stats["traces"] += 1
+
+        if self.profile is not None:
+            self.profile.stop()
+            stats["profiled"] += 1
+            ms = self.seconds * 1000.0
+            if ms >= PROFILE_SLOW_MS:
+                stamp = time.strftime("%Y%m%d-%H%M%S")
+                self.profile.save(f"{stamp}-{self.name}-{ms:.0f}ms-{os.getpid()}")
+                stats["profiles_saved"] += 1
+            self.profile = None
+        return False
+
+    def breakdown(self):
+        """Milliseconds per stage plus the whole trace under its own name."""
+        timings = {name: s * 1000.0 for name, s in self.stages.items()}
+        if self.seconds is not None:
+            timings[self.name] = self.seconds * 1000.0
+        return timings
+
+
+def trace(name: str):
+    return Trace(name) if _enabled else NOOP
+
+
+def span(name: str):
+    if not _enabled:
+        return NOOP
+    current = _current.get()
+    return NOOP if current is None else Span(current, name)
+
+
+def metrics_text() -> str:
+    return histograms.text()
+
+
+def counters_text(counters, prefix: str) -> str:
+    """Prometheus counter lines for a flat dict of running totals."""
+    lines = []
+    for key, value in sorted(counters.items()):
+        lines.append(f"# TYPE {prefix}_{key}_total counter")
+        lines.append(f"{prefix}_{key}_total {value}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+_metrics_server = None
+_metrics_lock = threading.Lock()
+
+
+def serve_metrics(host: str, port: int):
+    """Serves ``GET /metrics`` on a daemon thread, once per process."""
+    global _metrics_server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    with _metrics_lock:
+        if _metrics_server is None:
+            _metrics_server = ThreadingHTTPServer((host, port), Handler)
+            threading.Thread(
+                target=_metrics_server.serve_forever,
+                name="skillweave-metrics", daemon=True
+            ).start()
+    return _metrics_server
@@ -1,12 +1,168 @@
-import faiss
+import os
+import threading
 import numpy as np
+from core.tracing import span
+
+BACKENDS = ("flat", "ivf_flat", "ivf_sq8", "hnsw", "ivf_pq")
+
 
 class SemanticIndex:
-    def __init__(self, embeddings: np.ndarray):
+    def __init__(self, embeddings: np.ndarray, backend: str = "flat",
+                 nlist: int = 1024, nprobe: int = 16,
+                 hnsw_m: int = 32, ef_construction: int = 40, ef_search: int = 64,
+                 pq_m: int = 16, pq_nbits: int = 8):
+        import faiss
         self.dim = embeddings.shape[1]
-        self.index = faiss.IndexFlatIP(self.dim)
+        spec = self.spec(
+            backend, len(embeddings), nlist=nlist,
+            hnsw_m=hnsw_m, pq_m=pq_m, pq_nbits=pq_nbits
+        )
+        self.index = faiss.index_factory(self.dim, spec, faiss.METRIC_INNER_PRODUCT)
+
+        if backend == "hnsw":
+            self.index.hnsw.efConstruction = ef_construction
+        if not self.index.is_trained:
+            self.index.train(embeddings)
+
         self.index.add(embeddings)
+        self._selectors = {}
+        self._selectors_lock = threading.Lock()
+        self.configure(nprobe=nprobe, ef_search=ef_search)
+
+    @staticmethod
+    def spec(backend: str, n: int, nlist: int = 1024, hnsw_m: int = 32,
+             pq_m: int = 16, pq_nbits: int = 8) -> str:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown index backend '{backend}'.")
+        if backend == "flat":
+            return "Flat"
+        if backend == "hnsw":
+            return f"HNSW{hnsw_m}"
+
+        # k-means wants roughly 39 training points per centroid.
+        nlist = max(1, min(nlist, n // 39))
+        if backend == "ivf_flat":
+            return f"IVF{nlist},Flat"
+        if backend == "ivf_sq8":
+            return f"IVF{nlist},SQ8"
+
+        # Each PQ sub-quantizer trains 2**nbits centroids.
+        pq_nbits = max(1, min(pq_nbits, int(np.log2(max(n, 2)))))
+        return f"IVF{nlist},PQ{pq_m}x{pq_nbits}"
+
+    def configure(self, nprobe: int = None, ef_search: int = None):
+        import faiss
+        self.nprobe, self.ef_search = nprobe, ef_search
+        if nprobe is not None:
+            try:
+                faiss.extract_index_ivf(self.index).nprobe = nprobe
+            except RuntimeError:
+                pass
+        if ef_search is not None and hasattr(self.index, "hnsw"):
+            self.index.hnsw.efSearch = ef_search
 
     def search(self, query_vec, top_k: int):
         scores, idxs = self.index.search(query_vec, top_k)
         return scores[0], idxs[0]
+
+    def search_many(self, query_vecs, top_k: int, ids=None):
+        with span("index.search"):
+            if ids is None:
+                return self.index.search(query_vecs, top_k)
+            return self.search_subset(query_vecs, top_k, ids)
+
+    def search_subset(self, query_vecs, top_k: int, ids):
+        """Top-k restricted to ``ids``; always returns k hits when ``ids`` has them."""
+        import faiss
+        ids = np.asarray(ids, dtype=np.int64)
+
+        # Small subsets are scored exactly, at a cost proportional to the
+        # subset; larger ones let FAISS skip non-members during the scan.
+        if len(ids) * 8 <= self.index.ntotal or len(ids) <= 1024:
+            out_scores = np.full((len(query_vecs), top_k), -np.inf, dtype=np.float32)
+            out_ids = np.full((len(query_vecs), top_k), -1, dtype=np.int64)
+            k = min(top_k, len(ids))
+            if not k:
+                return out_scores, out_ids
+
+            scores = query_vecs @ self.vectors(ids).T
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            out_scores[:, :k] = np.take_along_axis(top_scores, order, axis=1)
+            out_ids[:, :k] = ids[np.take_along_axis(top, order, axis=1)]
+            return out_scores, out_ids
+
+        # The cache may evict the pair mid-search on another thread; holding
+        # it here keeps the bitmap the selector points into alive until done.
+        selector, bitmap = self.selector(ids)
+        return self.index.search(query_vecs, top_k, params=self._params(selector))
+
+    def selector(self, ids):
+        """(selector, bitmap) for ``ids``, built once per distinct subset.
+
+        The FAISS selector only points into the numpy bitmap, so callers
+        must keep both referenced for as long as they search with it.
+        """
+        import faiss
+        ids = np.asarray(ids, dtype=np.int64)
+        key = ids.tobytes()
+        with self._selectors_lock:
+            pair = self._selectors.get(key)
+            if pair is None:
+                if len(self._selectors) >= 64:
+                    self._selectors.clear()
+                mask = np.zeros(self.index.ntotal, dtype=bool)
+                mask[ids] = True
+                bitmap = np.packbits(mask, bitorder="little")
+                pair = (faiss.IDSelectorBitmap(len(mask), faiss.swig_ptr(bitmap)), bitmap)
+                self._selectors[key] = pair
+        return pair
+
+    def _params(self, selector):
+        import faiss
+        if hasattr(self.index, "hnsw"):
+            return faiss.SearchParametersHNSW(
+                sel=selector, efSearch=self.ef_search or self.index.hnsw.efSearch
+            )
+        try:
+            nprobe = faiss.extract_index_ivf(self.index).nprobe
+            return faiss.SearchParametersIVF(sel=selector, nprobe=self.nprobe or nprobe)
+        except RuntimeError:
+            return faiss.SearchParameters(sel=selector)
+
+    def vectors(self, ids) -> np.ndarray:
+        import faiss
+        ids = np.asarray(ids, dtype=np.int64)
+        try:
+            return self.index.reconstruct_batch(ids)
+        except RuntimeError:
+            # IVF indexes need an id -> list map before they can reconstruct.
+            faiss.extract_index_ivf(self.index).make_direct_map()
+            return self.index.reconstruct_batch(ids)
+
+    def save(self, path: str):
+        import faiss
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        faiss.write_index(self.index, tmp)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, nprobe: int = None,
+             ef_search: int = None):
+        import faiss
+        # Mapped read-only, the index pages are shared through the page
+        # cache by every process that opens the same file. IO_FLAG_MMAP_IFC
+        # also maps flat code arrays; older builds only map IVF lists.
+        flags = 0
+        if mmap:
+            flags = (getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+                     | faiss.IO_FLAG_READ_ONLY)
+        obj = cls.__new__(cls)
+        obj.index = faiss.read_index(path, flags)
+        obj.dim = obj.index.d
+        obj._selectors = {}
+        obj._selectors_lock = threading.Lock()
+        obj.configure(nprobe=nprobe, ef_search=ef_search)
+        return obj
@@ -0,0 +1,289 @@
+"""Per-stage and end-to-end latency of SkillWeave on synthetic corpora.
+
+Each corpus size gets freshly generated ``nco.csv``, ``skills.csv`` and
+``transitions.csv`` files in the shape of the ones under ``data/``, with
+caches in a temporary directory so the shared ones are left alone. Every
+size runs in its own process so peak RSS is per size. Stages:
+
+    construct_cold  SkillWeave build with empty caches (encodes the corpus)
+    construct_warm  the same build again from the caches
+    encode          EmbeddingEngine.encode, one query
+    search          SemanticIndex.search, one query
+    gap             SkillGapEngine.gap
+    next_roles      CareerGraph.next_roles
+    analyze         SkillWeave.analyze, unique queries
+    analyze_many    SkillWeave.analyze_many over the same number of unique
+                    queries in one call; ms per record
+
+Each run also reports analyze_many_speedup, the analyze_many throughput
+over that of the analyze loop; the batched path targets at least 10x.
+
+    python -m evaluation.benchmark --rows 100 1000 10000 --output base.json
+    python -m evaluation.benchmark --compare base.json new.json --threshold 0.1
+
+Encoding dominates construct_cold; at 1e6 rows expect hours on a CPU.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+from config.settings import (
+    TOP_K, EMBEDDING_MODEL, EMBEDDING_BACKEND, INDEX_BACKEND, RETRIEVAL_MODE
+)
+from core.lexical_index import tokenize
+from evaluation.timing import percentiles, peak_rss_mb, timed
+from utils.paths import resolve
+
+SECTORS = ("Agriculture", "Manufacturing", "Construction", "IT", "Health",
+           "Education", "Retail", "Transport", "Finance", "Public Service")
+STAGES = ("construct_cold", "construct_warm", "encode", "search", "gap",
+          "next_roles", "analyze", "analyze_many")
+SPEEDUP_TARGET = 10.0
+
+
+def vocabulary(min_words=500, seed=0):
+    """Words of the real NCO descriptions, padded with made-up ones."""
+    words = set()
+    if os.path.exists(resolve("data/nco.csv")):
+        df = pd.read_csv(resolve("data/nco.csv"), usecols=["title", "description"])
+        for text in df["title"].str.cat(df["description"], sep=" ").fillna(""):
+            words.update(w for w in tokenize(text) if w.isalpha() and len(w) > 2)
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    while len(words) < min_words:
+        words.add("".join(rng.choice(letters, int(rng.integers(4, 10)))))
+    return np.array(sorted(words))
+
+
+def synthetic_codes(rows):
+    # Four-digit families while they last, then eight-digit unit codes.
+    if rows <= 8889:
+        return np.arange(1111, 1111 + rows)
+    i = np.arange(rows)
+    return (1111 + i // 9999) * 10000 + i % 9999 + 1
+
+
+def sentences(words, rng, count, length):
+    picks = rng.integers(0, len(words), (count, length))
+    return [" ".join(row) for row in words[picks]]
+
+
+def generate(directory, rows, seed=0):
+    """Writes the three CSVs for a ``rows``-occupation corpus.
+
+    Returns their paths plus the nco and skills frames for building queries.
+    """
+    rng = np.random.default_rng(seed)
+    words = vocabulary(seed=seed)
+    codes = synthetic_codes(rows)
+
+    titles = [t.title() for t in sentences(words, rng, rows, 3)]
+    nco = pd.DataFrame({
+        "nco_code": codes,
+        "title": titles,
+        "description": sentences(words, rng, rows, 30),
+        "sector": np.array(SECTORS)[rng.integers(0, len(SECTORS), rows)],
+    })
+
+    skill_names = np.array(sorted({w.title() for w in words}))
+    per_role = rng.integers(3, 9, rows)
+    skills = pd.DataFrame({
+        "nco_code": np.repeat(codes, per_role),
+        "skill": skill_names[rng.integers(0, len(skill_names), per_role.sum())],
+    }).drop_duplicates()
+
+    edges = 3 * rows
+    transitions = pd.DataFrame({
+        "from_nco": codes[rng.integers(0, rows, edges)],
+        "to_nco": codes[rng.integers(0, rows, edges)],
+        "reason": np.array(["Lateral move", "Supervisory promotion",
+                            "Skill progression"])[rng.integers(0, 3, edges)],
+    })
+
+    paths = {}
+    for name, df in (("nco", nco), ("skills", skills), ("transitions", transitions)):
+        paths[name] = os.path.join(directory, f"{name}.csv")
+        df.to_csv(paths[name], index=False)
+    return paths, nco, skills
+
+
+def summarize(samples):
+    samples = list(samples)
+    total_s = sum(samples) / 1000.0
+    return {
+        **percentiles(samples),
+        "mean_ms": float(np.mean(samples)),
+        "n": len(samples),
+        "throughput_per_s": len(samples) / total_s if total_s else None,
+    }
+
+
+def run_size(rows, queries, seed=0):
+    from app.main import SkillWeave
+
+    rng = np.random.default_rng(seed + 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths, nco, skills = generate(tmp, rows, seed)
+        user_skills = skills["skill"].drop_duplicates().head(5).tolist()
+        del skills
+
+        def build():
+            engine = SkillWeave(paths["nco"], paths["skills"], paths["transitions"],
+                                cache_dir=os.path.join(tmp, "cache"))
+            engine.skills, engine.graph, engine.matcher
+            return engine
+
+        samples = {}
+        _, ms = timed(build)
+        samples["construct_cold"] = [ms]
+        engine, ms = timed(build)
+        samples["construct_warm"] = [ms]
+
+        # Queries paraphrase random rows; the number keeps each one unique so
+        # the query cache never answers for analyze.
+        picks = rng.integers(0, rows, queries)
+        texts = [
+            f"{nco['title'].iat[i]} {' '.join(nco['description'].iat[i].split()[:12])} {n}"
+            for n, i in enumerate(picks)
+        ]
+        codes = nco["nco_code"].to_numpy()[picks].tolist()
+        del nco
+
+        embedder, index = engine.matcher.embedder, engine.matcher.index
+        engine.analyze(texts[0] + " warm-up", user_skills)
+
+        vectors, samples["encode"] = [], []
+        for text in texts:
+            vec, ms = timed(embedder.encode, [text])
+            vectors.append(vec)
+            samples["encode"].append(ms)
+        samples["search"] = [timed(index.search, v, TOP_K)[1] for v in vectors]
+        samples["gap"] = [timed(engine.skills.gap, user_skills, c)[1] for c in codes]
+        samples["next_roles"] = [timed(engine.graph.next_roles, c)[1] for c in codes]
+        samples["analyze"] = [
+            timed(engine.analyze, f"{t} again", user_skills)[1] for t in texts
+        ]
+        # Fresh suffixes again, so neither path is served by the query cache.
+        _, ms = timed(engine.analyze_many, [f"{t} batched" for t in texts],
+                      [user_skills] * len(texts))
+        samples["analyze_many"] = [ms / len(texts)] * len(texts)
+
+    stages = {name: summarize(samples[name]) for name in STAGES}
+    speedup = stages["analyze"]["mean_ms"] / stages["analyze_many"]["mean_ms"]
+    print(f"rows={rows}: analyze_many is {speedup:.1f}x the analyze loop "
+          f"(target {SPEEDUP_TARGET:g}x)", file=sys.stderr)
+    return {
+        "rows": rows,
+        "stages": stages,
+        "analyze_many_speedup": speedup,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def meta():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "embedding_model": EMBEDDING_MODEL,
+        "embedding_backend": EMBEDDING_BACKEND,
+        "index_backend": INDEX_BACKEND,
+        "retrieval_mode": RETRIEVAL_MODE,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(base, new, threshold, min_delta_ms=0.05):
+    """Regressions of ``new`` against ``base``: slower percentiles, lower
+    throughput or analyze_many speedup, or higher peak RSS by more than
+    ``threshold`` (a fraction).
+    Latency changes under ``min_delta_ms`` are timer noise and never count."""
+    base_runs = {r["rows"]: r for r in base["runs"]}
+    regressions = []
+    print(f"{'rows':>9} {'stage':<16}{'metric':<18}{'base':>12}{'new':>12}{'change':>9}")
+
+    for run in new["runs"]:
+        ref = base_runs.get(run["rows"])
+        if ref is None:
+            continue
+
+        checks = [("peak_rss_mb", "-", ref["peak_rss_mb"], run["peak_rss_mb"], 1)]
+        if ref.get("analyze_many_speedup") and run.get("analyze_many_speedup"):
+            checks.append(("analyze_many_speedup", "-", ref["analyze_many_speedup"],
+                           run["analyze_many_speedup"], -1))
+        for stage, stats in run["stages"].items():
+            old = ref["stages"].get(stage)
+            if old is None:
+                continue
+            for metric in ("p50", "p95", "p99"):
+                checks.append((metric, stage, old[metric], stats[metric], 1))
+            if old["throughput_per_s"] and stats["throughput_per_s"]:
+                checks.append(("throughput_per_s", stage, old["throughput_per_s"],
+                               stats["throughput_per_s"], -1))
+
+        for metric, stage, old, value, sign in checks:
+            change = (value - old) / old if old else 0.0
+            flag = sign * change > threshold
+            if metric.startswith("p") and metric[1:].isdigit():
+                flag = flag and value - old > min_delta_ms
+            if flag:
+                regressions.append((run["rows"], stage, metric, change))
+            print(f"{run['rows']:>9} {stage:<16}{metric:<18}{old:>12.3f}{value:>12.3f}"
+                  f"{change:>+8.1%}{' REGRESSION' if flag else ''}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"),
+                        help="compare two reports instead of running")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative change that counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05,
+                        help="ignore latency changes smaller than this")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            base = json.load(f)
+        with open(args.compare[1]) as f:
+            new = json.load(f)
+        regressions = compare(base, new, args.threshold, args.min_delta_ms)
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1 if regressions else 0)
+
+    if len(args.rows) == 1:
+        runs = [run_size(args.rows[0], args.queries, args.seed)]
+    else:
+        runs = []
+        for rows in args.rows:
+            with tempfile.NamedTemporaryFile(suffix=".json") as out:
+                subprocess.run([
+                    sys.executable, "-m", "evaluation.benchmark",
+                    "--rows", str(rows), "--queries", str(args.queries),
+                    "--seed", str(args.seed), "--output", out.name
+                ], check=True)
+                runs.extend(json.load(out)["runs"])
+
+    report = json.dumps({"meta": meta(), "runs": runs}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Latency and match quality of chunked encoding on resume-length inputs.
+
+Synthetic resumes of 2-10 pages are assembled from NCO descriptions: one
+target occupation is the current role, written up at a random point among
+paragraphs about earlier, unrelated roles. Each mode matches every resume
+once; accuracy is whether the target code is the best match (top-1) or
+among the TOP_K results.
+
+    python -m evaluation.chunking_benchmark --resumes 50
+    python -m evaluation.chunking_benchmark --pages 8 10 --modes truncate max
+"""
+import argparse
+import numpy as np
+
+from config.settings import TOP_K, CHUNK_TOP_N
+from evaluation.timing import percentiles, timed
+
+MODES = ("truncate", "max", "mean")
+
+
+def paragraph(catalog, row, rng, words):
+    sentences = [
+        f"Worked as {catalog.text('title', row)}.", catalog.text("description", row)
+    ]
+    text = []
+    while sum(len(s.split()) for s in text) < words:
+        text.append(sentences[int(rng.integers(0, len(sentences)))])
+    return " ".join(text)
+
+
+def resumes(catalog, count, pages, words_per_page, seed=0):
+    """(text, nco_code) pairs; the target role takes a quarter of the words."""
+    rng = np.random.default_rng(seed)
+    out = []
+    for _ in range(count):
+        target = int(rng.integers(0, len(catalog)))
+        words = int(rng.integers(pages[0], pages[1] + 1)) * words_per_page
+        parts = [paragraph(catalog, target, rng, words // 4)]
+        while sum(len(p.split()) for p in parts) < words:
+            other = int(rng.integers(0, len(catalog)))
+            if other != target:
+                parts.append(paragraph(catalog, other, rng, 120))
+        rng.shuffle(parts)
+        out.append(("\n".join(parts), int(catalog.codes[target])))
+    return out
+
+
+def bench(matcher, docs, mode):
+    matcher.chunking = mode != "truncate"
+    if matcher.chunking:
+        matcher.chunk_aggregation = mode
+
+    latencies, top1, topk = [], 0, 0
+    for text, code in docs:
+        matches, ms = timed(matcher.match, text)
+        latencies.append(ms)
+        codes = [m["nco_code"] for m in matches]
+        top1 += bool(codes) and codes[0] == code
+        topk += code in codes
+
+    return latencies, top1 / len(docs), topk / len(docs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--pages", type=int, nargs=2, default=(2, 10),
+                        metavar=("MIN", "MAX"))
+    parser.add_argument("--words-per-page", type=int, default=450)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from intelligence.nco_matcher import NCOMatcher
+    matcher = NCOMatcher()
+    matcher.min_confidence = float("-inf")
+    docs = resumes(matcher.catalog, args.resumes, args.pages, args.words_per_page, args.seed)
+    matcher.match(docs[0][0])
+
+    words = [len(text.split()) for text, _ in docs]
+    print(f"resumes={len(docs)} pages={args.pages[0]}-{args.pages[1]} "
+          f"words={min(words)}-{max(words)} k={TOP_K} mean_top_n={CHUNK_TOP_N}")
+    print(f"{'mode':<10}{'top-1':>8}{'top-k':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for mode in args.modes:
+        latencies, top1, topk = bench(matcher, docs, mode)
+        pct = percentiles(latencies)
+        print(f"{mode:<10}{top1:>8.3f}{topk:>8.3f}"
+              f"{pct['p50']:>9.2f}{pct['p95']:>9.2f}{pct['p99']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Parity and throughput of the EmbeddingEngine backends.
+
+Encodes the NCO corpus with the torch backend and each ONNX backend,
+reports cosine drift against torch and single-core throughput, and exits
+non-zero when a backend drifts past its tolerance.
+
+    python -m evaluation.embedding_parity
+    python -m evaluation.embedding_parity --backends onnx-int8 --sentences 2000
+"""
+import argparse
+import sys
+import time
+import numpy as np
+
+from config.settings import EMBEDDING_MODEL, ONNX_DIR
+from core.embeddings import EmbeddingEngine, BACKENDS
+from utils.paths import resolve
+
+# Largest allowed 1 - cosine(torch, backend) for any sentence.
+MAX_DRIFT = {"onnx": 1e-4, "onnx-int8": 0.05}
+
+
+def corpus(limit):
+    import pandas as pd
+    df = pd.read_csv(resolve("data/nco.csv"))
+    texts = (df["title"] + ". " + df["description"]).tolist()
+    return (texts * (limit // len(texts) + 1))[:limit]
+
+
+def throughput(engine, texts, batch_size, repeat=3):
+    engine.encode(texts[:batch_size], batch_size=batch_size)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        vectors = engine.encode(texts, batch_size=batch_size)
+        best = min(best, time.perf_counter() - start)
+    return vectors, len(texts) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=EMBEDDING_MODEL)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS[1:]))
+    parser.add_argument("--sentences", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=1,
+                        help="inference threads; 1 gives sentences/sec per core")
+    args = parser.parse_args()
+
+    texts = corpus(args.sentences)
+    engines = {
+        b: EmbeddingEngine(args.model, backend=b, onnx_dir=resolve(ONNX_DIR),
+                           threads=args.threads)
+        for b in ["torch"] + [b for b in args.backends if b != "torch"]
+    }
+
+    results = {b: throughput(e, texts, args.batch_size) for b, e in engines.items()}
+    reference, torch_rate = results["torch"]
+
+    print(f"{len(texts)} sentences, batch {args.batch_size}, {args.threads} thread(s)")
+    print(f"{'backend':<11}{'sent/s/core':>12}{'speedup':>9}"
+          f"{'mean drift':>12}{'max drift':>11}  status")
+
+    failed = False
+    for backend, (vectors, rate) in results.items():
+        drift = 1.0 - np.sum(reference * vectors, axis=1)
+        limit = MAX_DRIFT.get(backend, 0.0)
+        ok = backend == "torch" or drift.max() <= limit
+        failed |= not ok
+        print(f"{backend:<11}{rate / args.threads:>12.1f}{rate / torch_rate:>9.2f}"
+              f"{drift.mean():>12.2e}{drift.max():>11.2e}  "
+              f"{'ok' if ok else f'FAIL (> {limit:g})'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
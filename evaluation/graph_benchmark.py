@@ -0,0 +1,74 @@
+"""Load time and memory of CareerGraph on synthetic transition tables.
+
+    python -m evaluation.graph_benchmark --edges 1000000 --nodes 3600
+    python -m evaluation.graph_benchmark --edges 5000000 --parquet
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from intelligence.career_graph import CareerGraph
+
+REASONS = (
+    "Backend skill progression", "Data-driven specialization",
+    "Infrastructure to development", "Supervisory promotion",
+    "Lateral move", "Certification upgrade",
+)
+
+
+def synthetic_transitions(edges, nodes, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = np.sort(rng.choice(np.arange(1111, 9999), nodes, replace=False))
+    return pd.DataFrame({
+        "from_nco": codes[rng.integers(0, nodes, edges)],
+        "to_nco": codes[rng.integers(0, nodes, edges)],
+        "reason": pd.Categorical.from_codes(
+            rng.integers(0, len(REASONS), edges), REASONS
+        ),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--nodes", type=int, default=3600)
+    parser.add_argument("--parquet", action="store_true")
+    args = parser.parse_args()
+
+    df = synthetic_transitions(args.edges, min(args.nodes, 8888))
+    suffix = ".parquet" if args.parquet else ".csv"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "transitions" + suffix)
+        if args.parquet:
+            df.to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False)
+        size = os.path.getsize(path)
+        del df
+
+        tracemalloc.start()
+        graph = CareerGraph(path=path)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for code in graph.codes[:1000]:
+            graph.next_roles(code)
+        lookup_us = (time.perf_counter() - start) * 1e6 / min(1000, len(graph.codes))
+
+    stats = graph.load_stats
+    print(f"input:       {args.edges:,} rows, {size / 2**20:.1f} MiB {suffix}")
+    print(f"graph:       {stats['nodes']:,} nodes, {stats['edges']:,} unique edges")
+    print(f"load:        {stats['seconds']:.2f} s")
+    print(f"resident:    {stats['bytes'] / 2**20:.1f} MiB in adjacency arrays")
+    print(f"peak alloc:  {peak / 2**20:.1f} MiB during load")
+    print(f"next_roles:  {lookup_us:.1f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Recall and latency of the approximate SemanticIndex backends.
+
+Every backend is measured against the exact ``flat`` index on the same
+vectors: recall@TOP_K is the overlap of the returned ids with the exact
+top-K, latency is per single-query search.
+
+    python -m evaluation.index_benchmark --rows 200000 --queries 1000
+    python -m evaluation.index_benchmark --nco
+"""
+import argparse
+import time
+import faiss
+import numpy as np
+
+from config.settings import (
+    TOP_K, INDEX_NLIST, INDEX_NPROBE, INDEX_HNSW_M,
+    INDEX_EF_CONSTRUCTION, INDEX_EF_SEARCH, INDEX_PQ_M, INDEX_PQ_NBITS
+)
+from core.vector_index import SemanticIndex, BACKENDS
+from evaluation.timing import percentiles, timed
+
+
+def synthetic(rows, dim, clusters=256, seed=0):
+    """Clustered unit vectors, closer to sentence embeddings than uniform noise."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype("float32")
+    x = centers[rng.integers(0, clusters, rows)]
+    x += 0.6 * rng.standard_normal((rows, dim)).astype("float32")
+    faiss.normalize_L2(x)
+    return x
+
+
+def nco_embeddings():
+    from intelligence.nco_matcher import NCOMatcher
+    matcher = NCOMatcher()
+    n = matcher.index.index.ntotal
+    return matcher.index.index.reconstruct_n(0, n)
+
+
+def recall_at_k(found, truth):
+    hits = sum(len(set(f) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def bench(base, queries, backend, top_k, params):
+    start = time.perf_counter()
+    index = SemanticIndex(base, backend=backend, **params)
+    build_s = time.perf_counter() - start
+
+    latencies, found = [], []
+    for q in queries:
+        (_, idxs), ms = timed(index.search, q[None, :], top_k)
+        latencies.append(ms)
+        found.append(idxs)
+
+    return index, build_s, np.array(found), latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--top-k", type=int, default=TOP_K)
+    parser.add_argument("--nco", action="store_true",
+                        help="use the NCO corpus embeddings instead of synthetic data")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS))
+    parser.add_argument("--nlist", type=int, default=INDEX_NLIST)
+    parser.add_argument("--nprobe", type=int, default=INDEX_NPROBE)
+    parser.add_argument("--ef-search", type=int, default=INDEX_EF_SEARCH)
+    args = parser.parse_args()
+
+    base = nco_embeddings() if args.nco else synthetic(args.rows, args.dim)
+    rng = np.random.default_rng(1)
+    queries = base[rng.integers(0, len(base), args.queries)].copy()
+    queries += 0.05 * rng.standard_normal(queries.shape).astype("float32")
+    faiss.normalize_L2(queries)
+
+    params = dict(
+        nlist=args.nlist, nprobe=args.nprobe,
+        hnsw_m=INDEX_HNSW_M, ef_construction=INDEX_EF_CONSTRUCTION,
+        ef_search=args.ef_search, pq_m=INDEX_PQ_M, pq_nbits=INDEX_PQ_NBITS
+    )
+
+    _, _, truth, _ = bench(base, queries, "flat", args.top_k, params)
+
+    print(f"rows={len(base)} dim={base.shape[1]} queries={len(queries)} k={args.top_k}")
+    print(f"{'backend':<10}{'spec':<18}{'build s':>9}{'recall':>9}"
+          f"{'p50 ms':>9}{'p99 ms':>9}{'MiB':>9}")
+    for backend in args.backends:
+        index, build_s, found, latencies = bench(
+            base, queries, backend, args.top_k, params
+        )
+        pct = percentiles(latencies)
+        size = faiss.serialize_index(index.index).nbytes / 2**20
+        spec = SemanticIndex.spec(backend, len(base), nlist=args.nlist,
+                                  hnsw_m=INDEX_HNSW_M, pq_m=INDEX_PQ_M,
+                                  pq_nbits=INDEX_PQ_NBITS)
+        print(f"{backend:<10}{spec:<18}{build_s:>9.2f}"
+              f"{recall_at_k(found, truth):>9.3f}"
+              f"{pct['p50']:>9.3f}{pct['p99']:>9.3f}{size:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,50 @@
-def confidence_ok(score):
-    return score > 0.65
+import numpy as np
+from config.settings import MIN_CONFIDENCE
+
+
+def confidence_ok(score, threshold=MIN_CONFIDENCE):
+    return score >= threshold
+
+
+def ranks(predictions, labels):
+    """1-based rank of each label in its ranked code list, 0 when missing."""
+    out = []
+    for codes, label in zip(predictions, labels):
+        out.append(codes.index(label) + 1 if label in codes else 0)
+    return np.array(out)
+
+
+def top_k_accuracy(predictions, labels, k):
+    r = ranks(predictions, labels)
+    return float(((r > 0) & (r <= k)).mean()) if len(r) else 0.0
+
+
+def mrr(predictions, labels):
+    r = ranks(predictions, labels)
+    return float(np.where(r > 0, 1.0 / np.maximum(r, 1), 0.0).mean()) if len(r) else 0.0
+
+
+def expected_calibration_error(confidences, correct, bins=10):
+    """Gap between confidence and accuracy, averaged over equal-width bins."""
+    confidences = np.clip(np.asarray(confidences, dtype="float64"), 0.0, 1.0)
+    correct = np.asarray(correct, dtype="float64")
+    if not len(confidences):
+        return 0.0
+    which = np.minimum((confidences * bins).astype(int), bins - 1)
+    ece = 0.0
+    for b in range(bins):
+        members = which == b
+        if members.any():
+            ece += members.mean() * abs(confidences[members].mean() - correct[members].mean())
+    return float(ece)
+
+
+def gated(confidences, correct, threshold=MIN_CONFIDENCE):
+    """Coverage and top-1 precision of the matches ``confidence_ok`` accepts."""
+    confidences = np.asarray(confidences, dtype="float64")
+    correct = np.asarray(correct, dtype=bool)
+    accepted = confidence_ok(confidences, threshold)
+    return {
+        "coverage": float(accepted.mean()) if len(accepted) else 0.0,
+        "precision": float(correct[accepted].mean()) if accepted.any() else 0.0,
+    }
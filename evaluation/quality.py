@@ -0,0 +1,173 @@
+"""Match quality against latency and memory across matcher configurations.
+
+Every combination of --models, --embedding-backends, --index-backends,
+--top-k and --retrieval (dense, or hybrid:<HYBRID_FUSION>) is scored on a
+labeled CSV of ``text,nco_code`` rows against the matcher's own NCO data
+(data/nco.csv, with or without a sector column). Each combination runs in
+a fresh process with those settings, so peak RSS is its own. Reported per
+configuration:
+
+    top1, topk   accuracy of the best match / of any of the TOP_K matches
+    mrr          mean reciprocal rank of the label within TOP_K
+    ece          expected calibration error of the top-1 confidence
+    coverage,    share of queries whose top-1 confidence passes
+    precision    MIN_CONFIDENCE, and top-1 accuracy among those
+    p50, p95     NCOMatcher.match latency in ms
+    rss, index   peak RSS and serialized index size in MiB
+
+Rows marked * are Pareto-optimal: no other row is at least as accurate
+(top1), as fast (p50) and as small (rss) while better on one of them.
+Configurations run --jobs at a time; use --jobs 1 for latencies free of
+contention.
+
+    python -m evaluation.quality
+    python -m evaluation.quality --index-backends flat hnsw ivf_sq8 --top-k 3 5 10
+    python -m evaluation.quality --embedding-backends torch onnx onnx-int8 --jobs 2
+    python -m evaluation.quality --retrieval dense hybrid:rrf hybrid:weighted
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from config.settings import (
+    EMBEDDING_MODEL, EMBEDDING_BACKEND, INDEX_BACKEND, TOP_K, MIN_CONFIDENCE,
+    RETRIEVAL_MODE, HYBRID_FUSION
+)
+from evaluation.metrics import top_k_accuracy, mrr, expected_calibration_error, gated
+from evaluation.timing import percentiles, peak_rss_mb, timed
+from utils.paths import resolve
+
+LABELED_PATH = "data/eval_labeled.csv"
+
+
+def load_labeled(path):
+    import csv
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    return [r["text"] for r in rows], [int(r["nco_code"]) for r in rows]
+
+
+def evaluate(cfg, labeled_path):
+    """Scores one configuration; runs in its own process."""
+    import config.settings as settings
+    settings.EMBEDDING_MODEL = cfg["model"]
+    settings.EMBEDDING_BACKEND = cfg["embedding_backend"]
+    settings.INDEX_BACKEND = cfg["index_backend"]
+    settings.TOP_K = cfg["top_k"]
+    settings.HYBRID_CANDIDATES = 4 * cfg["top_k"]
+    settings.QUERY_CACHE_PATH = None
+    mode, _, fusion = cfg["retrieval"].partition(":")
+    settings.RETRIEVAL_MODE = mode
+    if fusion:
+        settings.HYBRID_FUSION = fusion
+
+    import faiss
+    from intelligence.nco_matcher import NCOMatcher
+
+    texts, labels = load_labeled(labeled_path)
+    matcher, build_ms = timed(NCOMatcher)
+    # A label the matcher can never return would only read as a miss.
+    unknown = sorted(set(labels) - set(matcher.catalog.codes.tolist()))
+    if unknown:
+        raise ValueError(f"Labels missing from the NCO data: {unknown}")
+    # Rank and calibrate over every match; gating is scored separately.
+    matcher.min_confidence = float("-inf")
+    matcher.match("warm up the encoder")
+
+    predictions, confidences, latencies = [], [], []
+    for text in texts:
+        matches, ms = timed(matcher.match, text)
+        latencies.append(ms)
+        predictions.append([m["nco_code"] for m in matches])
+        confidences.append(matches[0]["confidence"] if matches else 0.0)
+
+    correct = [bool(p) and p[0] == y for p, y in zip(predictions, labels)]
+    pct = percentiles(latencies, qs=(50, 95))
+    return {
+        **cfg,
+        "queries": len(texts),
+        "top1": top_k_accuracy(predictions, labels, 1),
+        "topk": top_k_accuracy(predictions, labels, cfg["top_k"]),
+        "mrr": mrr(predictions, labels),
+        "ece": expected_calibration_error(confidences, correct),
+        **gated(confidences, correct, MIN_CONFIDENCE),
+        "p50": pct["p50"],
+        "p95": pct["p95"],
+        "build_s": build_ms / 1000.0,
+        "rss_mb": peak_rss_mb(),
+        "index_mb": faiss.serialize_index(matcher.index.index).nbytes / 2**20,
+    }
+
+
+def pareto(rows):
+    """Marks rows that no other row dominates on (top1, p50, rss_mb)."""
+    for row in rows:
+        row["pareto"] = not any(
+            o["top1"] >= row["top1"] and o["p50"] <= row["p50"]
+            and o["rss_mb"] <= row["rss_mb"]
+            and (o["top1"], o["p50"], o["rss_mb"]) != (row["top1"], row["p50"], row["rss_mb"])
+            for o in rows
+        )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--labeled", default=LABELED_PATH,
+                        help="CSV with text and nco_code columns")
+    parser.add_argument("--models", nargs="+", default=[EMBEDDING_MODEL])
+    parser.add_argument("--embedding-backends", nargs="+", default=[EMBEDDING_BACKEND])
+    parser.add_argument("--index-backends", nargs="+", default=[INDEX_BACKEND])
+    parser.add_argument("--top-k", type=int, nargs="+", default=[TOP_K])
+    parser.add_argument(
+        "--retrieval", nargs="+",
+        choices=("dense", "hybrid:rrf", "hybrid:weighted"),
+        default=[RETRIEVAL_MODE if RETRIEVAL_MODE == "dense"
+                 else f"{RETRIEVAL_MODE}:{HYBRID_FUSION}"]
+    )
+    parser.add_argument("--jobs", type=int, default=max(1, (os.cpu_count() or 1) // 2))
+    parser.add_argument("--output", help="also write the rows as JSON here")
+    args = parser.parse_args()
+
+    configs = [
+        {"model": m, "embedding_backend": e, "index_backend": i, "top_k": k,
+         "retrieval": r}
+        for m, e, i, k, r in itertools.product(
+            args.models, args.embedding_backends, args.index_backends, args.top_k,
+            args.retrieval
+        )
+    ]
+
+    # Settings are read at import, so every configuration needs a fresh
+    # interpreter rather than a reused worker.
+    with ProcessPoolExecutor(
+        max_workers=args.jobs, mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=1
+    ) as pool:
+        futures = [pool.submit(evaluate, cfg, resolve(args.labeled)) for cfg in configs]
+        rows = pareto([f.result() for f in futures])
+
+    rows.sort(key=lambda r: (-r["top1"], r["p50"]))
+    print(f"{len(configs)} configurations, {rows[0]['queries'] if rows else 0} "
+          f"labeled queries, MIN_CONFIDENCE={MIN_CONFIDENCE}")
+    print(f"  {'model':<22}{'embed':<10}{'index':<9}{'retrieval':<16}{'k':>3}"
+          f"{'top1':>7}{'topk':>7}{'mrr':>7}{'ece':>7}{'cover':>7}{'prec':>7}{'p50 ms':>9}{'p95 ms':>9}"
+          f"{'rss MiB':>9}{'idx MiB':>9}")
+    for r in rows:
+        print(f"{'*' if r['pareto'] else ' '} {r['model'][:21]:<22}"
+              f"{r['embedding_backend']:<10}{r['index_backend']:<9}"
+              f"{r['retrieval']:<16}{r['top_k']:>3}"
+              f"{r['top1']:>7.3f}{r['topk']:>7.3f}{r['mrr']:>7.3f}{r['ece']:>7.3f}"
+              f"{r['coverage']:>7.3f}{r['precision']:>7.3f}{r['p50']:>9.2f}"
+              f"{r['p95']:>9.2f}{r['rss_mb']:>9.1f}{r['index_mb']:>9.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
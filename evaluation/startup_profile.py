@@ -0,0 +1,96 @@
+"""Cold-start profile of ``import app.main``.
+
+Runs the import in fresh interpreters with ``-X importtime``, prints the
+slowest modules by cumulative time, and fails (exit 1) when the median
+import exceeds STARTUP_BUDGET_MS or when a heavy dependency is imported
+eagerly.
+
+    python -m evaluation.startup_profile
+    python -m evaluation.startup_profile --module app.server --max-ms 600
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from config.settings import STARTUP_BUDGET_MS
+from utils.paths import BASE_DIR
+
+# Modules that must only load on first use.
+HEAVY_MODULES = ("sentence_transformers", "torch", "faiss", "pandas", "networkx")
+
+
+def run_import(module):
+    code = (
+        "import sys, json, time\n"
+        "t = time.perf_counter()\n"
+        f"import {module}\n"
+        "ms = (time.perf_counter() - t) * 1000\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'ms': ms, 'heavy': heavy}))\n"
+    )
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BASE_DIR, capture_output=True, text=True,
+        env={**os.environ, "PYTHONPATH": BASE_DIR},
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    report = json.loads(proc.stdout.strip().splitlines()[-1])
+    report["wall_ms"] = wall_ms
+    report["modules"] = parse_importtime(proc.stderr)
+    return report
+
+
+def parse_importtime(stderr):
+    """``{module: (self_us, cumulative_us)}`` from ``-X importtime`` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--max-ms", type=float, default=STARTUP_BUDGET_MS)
+    args = parser.parse_args()
+
+    reports = [run_import(args.module) for _ in range(args.runs)]
+    import_ms = statistics.median(r["ms"] for r in reports)
+    wall_ms = statistics.median(r["wall_ms"] for r in reports)
+    last = reports[-1]
+
+    print(f"import {args.module}: median {import_ms:.1f} ms "
+          f"(interpreter + import {wall_ms:.1f} ms, {args.runs} runs)")
+    print(f"\n{'cumulative ms':>14}{'self ms':>10}  module")
+    slowest = sorted(last["modules"].items(), key=lambda kv: -kv[1][1])
+    for name, (self_us, cumulative_us) in slowest[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f}{self_us / 1000:>10.1f}  {name}")
+
+    failed = False
+    if last["heavy"]:
+        print(f"\nFAIL: imported eagerly: {', '.join(last['heavy'])}")
+        failed = True
+    if import_ms > args.max_ms:
+        print(f"\nFAIL: {import_ms:.1f} ms exceeds the {args.max_ms:.0f} ms budget")
+        failed = True
+    if not failed:
+        print(f"\nOK: within the {args.max_ms:.0f} ms budget")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
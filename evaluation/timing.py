@@ -0,0 +1,21 @@
+import resource
+import sys
+import time
+import numpy as np
+
+
+def percentiles(samples, qs=(50, 95, 99)):
+    arr = np.asarray(samples, dtype="float64")
+    return {f"p{q}": float(np.percentile(arr, q)) for q in qs}
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, (time.perf_counter() - start) * 1000.0
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (2**20 if sys.platform == "darwin" else 2**10)
@@ -1,18 +1,213 @@
-import pandas as pd
-import networkx as nx
+import heapq
+import time
+from functools import lru_cache
+import numpy as np
 from utils.paths import resolve
+from config.settings import (
+    PATH_CACHE_SIZE, TRANSITION_REASON_WEIGHTS, TRANSITIONS_PATH
+)
+
+WEIGHTS = ("hops", "reason", "skill_gap")
+
+
+def _csr(src, dst, n):
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, dst[order].astype(np.int32), order
+
+
+def _bfs(indptr, indices, start, max_hops):
+    """Hop distance from ``start`` to every node, -1 when out of range."""
+    dist = np.full(len(indptr) - 1, -1, dtype=np.int32)
+    dist[start] = 0
+    frontier = np.array([start], dtype=np.int64)
+
+    for hop in range(1, max_hops + 1):
+        begin, end = indptr[frontier], indptr[frontier + 1]
+        counts = end - begin
+        total = int(counts.sum())
+        if not total:
+            break
+
+        # Concatenate the neighbour ranges of the whole frontier at once.
+        offsets = np.repeat(begin - (np.cumsum(counts) - counts), counts)
+        nbrs = indices[offsets + np.arange(total)]
+        nbrs = np.unique(nbrs[dist[nbrs] < 0])
+        if not nbrs.size:
+            break
+
+        dist[nbrs] = hop
+        frontier = nbrs
+
+    return dist
+
 
 class CareerGraph:
-    def __init__(self):
-        self.graph = nx.DiGraph()
-        df = pd.read_csv(resolve("data/transitions.csv"))
-
-        for _, row in df.iterrows():
-            self.graph.add_edge(
-                int(row.from_nco),
-                int(row.to_nco),
-                reason=row.reason
+    def __init__(self, skills=None, path=TRANSITIONS_PATH):
+        started = time.perf_counter()
+        self.skills = skills
+        self._load(resolve(path))
+        self._graph = None
+        self._weights = {}
+        self._paths = lru_cache(maxsize=PATH_CACHE_SIZE)(self._search_paths)
+        self._reachable = lru_cache(maxsize=PATH_CACHE_SIZE)(self._search_reachable)
+
+        arrays = (self.codes, self.indptr, self.indices, self.reason_codes,
+                  self.rev_indptr, self.rev_indices)
+        self.load_stats = {
+            "edges": len(self.indices),
+            "nodes": len(self.codes),
+            "seconds": time.perf_counter() - started,
+            "bytes": sum(a.nbytes for a in arrays),
+        }
+
+    def _load(self, path):
+        import pandas as pd
+        columns = ["from_nco", "to_nco", "reason"]
+        if path.endswith(".parquet"):
+            df = pd.read_parquet(path, columns=columns)
+        else:
+            df = pd.read_csv(
+                path, usecols=columns,
+                dtype={"from_nco": "int64", "to_nco": "int64", "reason": "category"}
             )
 
+        src_codes = df["from_nco"].to_numpy(dtype=np.int64)
+        dst_codes = df["to_nco"].to_numpy(dtype=np.int64)
+        reasons = df["reason"].astype("category").cat
+        # Blank reasons (category code -1) point at a trailing None entry,
+        # which has no name and the default weight.
+        self.reason_names = tuple(reasons.categories) + (None,)
+        reason_codes = reasons.codes.to_numpy().astype(np.int32)
+        reason_codes[reason_codes < 0] = len(self.reason_names) - 1
+        del df
+
+        self.codes = np.unique(np.concatenate([src_codes, dst_codes]))
+        n = len(self.codes)
+        src = np.searchsorted(self.codes, src_codes)
+        dst = np.searchsorted(self.codes, dst_codes)
+
+        # Repeated edges keep their first position and their last reason,
+        # matching DiGraph.add_edge.
+        pair = src * n + dst
+        _, first = np.unique(pair, return_index=True)
+        _, last = np.unique(pair[::-1], return_index=True)
+        last = len(pair) - 1 - last
+        by_first = np.argsort(first)
+        keep, reason_rows = first[by_first], last[by_first]
+        src, dst = src[keep], dst[keep]
+
+        self.indptr, self.indices, order = _csr(src, dst, n)
+        self.reason_codes = reason_codes[reason_rows][order]
+        self.rev_indptr, self.rev_indices, _ = _csr(dst, src, n)
+
+    def _node(self, nco_code):
+        i = int(np.searchsorted(self.codes, nco_code))
+        if i < len(self.codes) and self.codes[i] == nco_code:
+            return i
+        return None
+
+    @property
+    def graph(self):
+        """networkx view of the transitions, built on first access."""
+        if self._graph is None:
+            import networkx as nx
+            graph = nx.DiGraph()
+            src = np.repeat(self.codes, np.diff(self.indptr))
+            graph.add_edges_from(
+                (int(s), int(self.codes[t]), {"reason": self.reason_names[r]})
+                for s, t, r in zip(src, self.indices, self.reason_codes)
+            )
+            self._graph = graph
+        return self._graph
+
+    def _edge_weights(self, weight):
+        if weight not in WEIGHTS:
+            raise ValueError(f"Unknown edge weight '{weight}'.")
+        if weight in self._weights:
+            return self._weights[weight]
+
+        if weight == "hops":
+            w = np.ones(len(self.indices))
+        elif weight == "reason":
+            table = np.array([
+                1.0 if r is None else TRANSITION_REASON_WEIGHTS.get(r, 1.0)
+                for r in self.reason_names
+            ])
+            w = table[self.reason_codes]
+        else:
+            if self.skills is None:
+                raise ValueError("Skill-gap weights need a SkillGapEngine.")
+            # One step plus every skill the target needs that the source
+            # role does not already cover.
+            src = np.repeat(np.arange(len(self.codes)), np.diff(self.indptr))
+            w = np.array([
+                1.0 + len(
+                    self.skills.required.get(int(self.codes[t]), frozenset())
+                    - self.skills.required.get(int(self.codes[s]), frozenset())
+                )
+                for s, t in zip(src, self.indices)
+            ])
+
+        self._weights[weight] = w
+        return w
+
+    def _search_paths(self, source, target, max_hops, k, weight):
+        # Best-first search over partial paths yields complete paths in
+        # cost order; nodes that cannot reach the target within the
+        # remaining hops are pruned via a reverse BFS.
+        to_target = _bfs(self.rev_indptr, self.rev_indices, target, max_hops)
+        if to_target[source] < 0:
+            return ()
+
+        w = self._edge_weights(weight)
+        found = []
+        heap = [(0.0, (source,))]
+
+        while heap and len(found) < k:
+            cost, path = heapq.heappop(heap)
+            node = path[-1]
+            if node == target:
+                found.append((cost, path))
+                continue
+
+            remaining = max_hops - (len(path) - 1)
+            for e in range(self.indptr[node], self.indptr[node + 1]):
+                nxt = int(self.indices[e])
+                if nxt in path or not 0 <= to_target[nxt] < remaining:
+                    continue
+                heapq.heappush(heap, (cost + float(w[e]), path + (nxt,)))
+
+        return tuple(found)
+
+    def _search_reachable(self, source, max_hops):
+        dist = _bfs(self.indptr, self.indices, source, max_hops)
+        nodes = np.flatnonzero(dist > 0)
+        nodes = nodes[np.lexsort((self.codes[nodes], dist[nodes]))]
+        return tuple((int(self.codes[i]), int(dist[i])) for i in nodes)
+
     def next_roles(self, nco_code):
-        return list(self.graph.successors(nco_code))
+        node = self._node(nco_code)
+        if node is None:
+            return []
+        succ = self.indices[self.indptr[node]:self.indptr[node + 1]]
+        return self.codes[succ].tolist()
+
+    def paths(self, from_nco, to_nco, max_hops=3, k=3, weight="hops"):
+        source = self._node(from_nco)
+        target = self._node(to_nco)
+        if source is None or target is None or source == target:
+            return []
+
+        found = self._paths(source, target, max_hops, k, weight)
+        return [
+            {"path": [int(self.codes[i]) for i in path], "cost": cost}
+            for cost, path in found
+        ]
+
+    def reachable(self, from_nco, max_hops=3):
+        source = self._node(from_nco)
+        if source is None:
+            return {}
+        return dict(self._reachable(source, max_hops))
@@ -0,0 +1,46 @@
+import re
+import numpy as np
+
+# NCO-2015 levels by number of code digits; units are the 8-digit
+# sub-codes written as 6111.0101 (or 61110101 when stored as integers).
+LEVELS = {1: "division", 2: "sub_division", 3: "group", 4: "family", 8: "unit"}
+
+CODE_RE = re.compile(r"^\s*(\d{1,4})(?:\.?(\d{4}))?\s*$")
+
+
+def parse_code(text: str):
+    """Canonical digit string for a code or prefix, or None for other text."""
+    m = CODE_RE.match(text)
+    if not m or (m.group(2) and len(m.group(1)) != 4):
+        return None
+    return m.group(1) + (m.group(2) or "")
+
+
+class CodeHierarchy:
+    """Rows of every division, sub-division, group, family and unit.
+
+    Each prefix maps to the positions of its rows in code order, so exact
+    codes and prefixes resolve with one dict lookup.
+    """
+
+    def __init__(self, codes):
+        keys = [parse_code(str(c)) or "" for c in codes]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+
+        members = {}
+        for row in order:
+            key = keys[row]
+            for length in LEVELS:
+                if length <= len(key):
+                    members.setdefault(key[:length], []).append(row)
+
+        self.rows = {k: np.asarray(v, dtype=np.int64) for k, v in members.items()}
+
+    def lookup(self, text: str):
+        key = parse_code(text)
+        return None if key is None else self.rows.get(key)
+
+    @staticmethod
+    def level(text: str):
+        key = parse_code(text)
+        return None if key is None else LEVELS.get(len(key))
@@ -1,34 +1,329 @@
-import pandas as pd
-from core.embeddings import EmbeddingEngine
+import os
+import threading
+import numpy as np
+from core.embeddings import EmbeddingEngine, QueryCache
+from core.embedding_cache import EmbeddingCache
 from core.vector_index import SemanticIndex
+from core.lexical_index import BM25Index, tokenize
+from core.chunking import chunk_text, aggregate
+from core.tracing import span
+from intelligence.code_hierarchy import CodeHierarchy
+from intelligence.occupation_catalog import OccupationCatalog
 from utils.paths import resolve
-from config.settings import EMBEDDING_MODEL, TOP_K
+from config.settings import (
+    NCO_PATH, EMBEDDING_MODEL, EMBEDDING_CACHE_DIR, INDEX_DIR, CATALOG_DIR, TOP_K,
+    INDEX_BACKEND, INDEX_NLIST, INDEX_NPROBE, INDEX_HNSW_M,
+    INDEX_EF_CONSTRUCTION, INDEX_EF_SEARCH, INDEX_PQ_M, INDEX_PQ_NBITS,
+    QUERY_CACHE_SIZE, QUERY_CACHE_TTL, QUERY_CACHE_PATH, QUERY_CACHE_SHARED_SIZE,
+    EMBEDDING_BACKEND, EMBEDDING_THREADS, ONNX_DIR,
+    RETRIEVAL_MODE, HYBRID_FUSION, HYBRID_ALPHA, HYBRID_CANDIDATES, RRF_K,
+    CHUNKING, CHUNK_THRESHOLD_WORDS, CHUNK_WORDS, CHUNK_OVERLAP_SENTENCES,
+    CHUNK_AGGREGATION, CHUNK_TOP_N,
+    MIN_CONFIDENCE
+)
+
+BUILD_PARAMS = dict(
+    nlist=INDEX_NLIST, hnsw_m=INDEX_HNSW_M,
+    pq_m=INDEX_PQ_M, pq_nbits=INDEX_PQ_NBITS
+)
+SEARCH_PARAMS = dict(nprobe=INDEX_NPROBE, ef_search=INDEX_EF_SEARCH)
 
 class NCOMatcher:
-    def __init__(self):
-        self.df = pd.read_csv(resolve("data/nco.csv"))
-        self.embedder = EmbeddingEngine(EMBEDDING_MODEL)
+    def __init__(self, path=NCO_PATH, cache_dir=None):
+        # cache_dir replaces the parent of the catalog, embedding and index
+        # caches, e.g. to keep benchmark corpora out of the shared ones.
+        def cache(default):
+            if cache_dir is None:
+                return resolve(default)
+            return os.path.join(cache_dir, os.path.basename(default))
+
+        self.catalog = OccupationCatalog.open(resolve(path), cache(CATALOG_DIR))
+        self.embedder = EmbeddingEngine(
+            EMBEDDING_MODEL,
+            query_cache=QueryCache(
+                QUERY_CACHE_SIZE, QUERY_CACHE_TTL,
+                resolve(QUERY_CACHE_PATH) if QUERY_CACHE_PATH else None,
+                shared_maxsize=QUERY_CACHE_SHARED_SIZE
+            ),
+            backend=EMBEDDING_BACKEND,
+            onnx_dir=resolve(ONNX_DIR),
+            threads=EMBEDDING_THREADS
+        )
+
+        # The sector column is optional (data/nco.csv ships without one); when
+        # absent the corpus omits it and sector filters are unavailable.
+        titles = self.catalog.column("title")
+        descriptions = self.catalog.column("description")
+        sectors = self.catalog.column("sector") if "sector" in self.catalog else None
+        if sectors is None:
+            corpus = [f"{t}. {d}" for t, d in zip(titles, descriptions)]
+        else:
+            corpus = [
+                f"{t}. {d}. Sector: {s}" for t, d, s in zip(titles, descriptions, sectors)
+            ]
+
+        self.cache = EmbeddingCache(cache(EMBEDDING_CACHE_DIR), self.embedder.name)
+        spec = SemanticIndex.spec(INDEX_BACKEND, len(corpus), **BUILD_PARAMS)
+        index_path = os.path.join(
+            cache(INDEX_DIR),
+            f"nco-{self.cache.digest(corpus)}-{spec.replace(',', '_')}.faiss"
+        )
+
+        self._embeddings = None
+        if os.path.exists(index_path):
+            self.index = SemanticIndex.load(index_path, mmap=True, **SEARCH_PARAMS)
+        else:
+            self._embeddings = self.cache.encode(self.embedder, corpus)
+            self.index = SemanticIndex(
+                self._embeddings, backend=INDEX_BACKEND,
+                ef_construction=INDEX_EF_CONSTRUCTION,
+                **BUILD_PARAMS, **SEARCH_PARAMS
+            )
+            self.index.save(index_path)
 
-        corpus = (
-            self.df["title"] + ". " +
-            self.df["description"] + ". Sector: " +
-            self.df["sector"]
-        ).tolist()
+        self.lexical = BM25Index(corpus)
 
-        self.embeddings = self.embedder.encode(corpus)
-        self.index = SemanticIndex(self.embeddings)
+        # Codes, code prefixes and normalised titles resolve without the encoder.
+        self.hierarchy = CodeHierarchy(self.catalog.codes)
+        self.exact = {}
+        for i, title in enumerate(titles):
+            self.exact.setdefault(" ".join(tokenize(title)), i)
 
-    def match(self, text: str):
-        query = self.embedder.encode([text])
-        scores, idxs = self.index.search(query, TOP_K)
+        # Row sets for metadata filters, built once; combined filters are
+        # memoised so repeated requests reuse the same subset and selector.
+        self.sectors = {}
+        if sectors is not None:
+            names, inverse = np.unique(sectors, return_inverse=True)
+            for i, sector in enumerate(names):
+                self.sectors[" ".join(tokenize(sector))] = np.flatnonzero(inverse == i)
+        self._subsets = {}
 
+        self.chunking = CHUNKING
+        self.chunk_aggregation = CHUNK_AGGREGATION
+        self.min_confidence = MIN_CONFIDENCE
+
+        self.stats = {"queries": 0, "direct": 0, "dense": 0,
+                      "filtered": 0, "empty": 0}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def embeddings(self):
+        """Corpus vectors, read back from the index when it was loaded from
+        disk; approximate for the quantised backends."""
+        if self._embeddings is None:
+            self._embeddings = self.index.vectors(np.arange(self.index.index.ntotal))
+        return self._embeddings
+
+    def _results(self, scores, idxs, source=RETRIEVAL_MODE):
+        # source is how the match was found: direct (code or title lookup),
+        # neighbour (nearest occupations to a direct hit), dense or hybrid.
+        # confidence is the cosine to the query, or to the direct hit for
+        # neighbours, and 1.0 for direct rows.
         results = []
         for score, idx in zip(scores, idxs):
-            row = self.df.iloc[idx]
+            if idx < 0:
+                continue
             results.append({
-                "nco_code": int(row.nco_code),
-                "title": row.title,
-                "confidence": float(score)
+                "nco_code": int(self.catalog.codes[idx]),
+                "title": self.catalog.text("title", idx),
+                "confidence": float(score),
+                "source": source
             })
 
         return results
+
+    def _hybrid(self, text, query, dense_scores, dense_idxs, ids=None):
+        lex_scores, lex_idxs = self.lexical.search(text, HYBRID_CANDIDATES, ids)
+        cosine = {int(i): float(s) for s, i in zip(dense_scores, dense_idxs) if i >= 0}
+
+        # Lexical-only candidates still report a cosine confidence.
+        missing = [int(i) for i in lex_idxs if i not in cosine]
+        if missing:
+            cosine.update(zip(missing, self._similarity(missing, query).tolist()))
+
+        if HYBRID_FUSION == "rrf":
+            fused = dict.fromkeys(cosine, 0.0)
+            for ranked in (dense_idxs[dense_idxs >= 0], lex_idxs):
+                for rank, i in enumerate(ranked.tolist()):
+                    fused[i] += 1.0 / (RRF_K + rank + 1)
+        else:
+            top = float(lex_scores[0]) if len(lex_scores) else 1.0
+            lexical = dict(zip(lex_idxs.tolist(), (lex_scores / top).tolist()))
+            fused = {
+                i: HYBRID_ALPHA * c + (1 - HYBRID_ALPHA) * lexical.get(i, 0.0)
+                for i, c in cosine.items()
+            }
+
+        best = sorted(fused, key=fused.get, reverse=True)[:TOP_K]
+        return self._results([cosine[i] for i in best], best)
+
+    def _similarity(self, rows, query):
+        """Cosine of ``rows`` to a query vector, or pooled over chunk vectors."""
+        sims = self.index.vectors(rows) @ np.atleast_2d(query).T
+        return aggregate(sims, self.chunk_aggregation, CHUNK_TOP_N)
+
+    def _chunks(self, text):
+        """Sentence windows for inputs past the encoder's limit, else None."""
+        if not self.chunking or len(text.split()) <= CHUNK_THRESHOLD_WORDS:
+            return None
+        return chunk_text(text, CHUNK_WORDS, CHUNK_OVERLAP_SENTENCES)
+
+    def _pooled(self, chunk_vecs, idxs, k):
+        """Candidates found by any chunk, re-scored over every chunk."""
+        rows = np.unique(idxs[idxs >= 0])
+        if not rows.size:
+            return np.zeros(0, dtype=np.float32), rows
+        scores = self._similarity(rows, chunk_vecs)
+        order = np.argsort(-scores, kind="stable")[:k]
+        return scores[order], rows[order]
+
+    def _direct(self, text, ids):
+        """Rows for a code, prefix or exact title, or None to run retrieval."""
+        rows = self.hierarchy.lookup(text)
+        if rows is None:
+            exact = self.exact.get(" ".join(tokenize(text)))
+            rows = None if exact is None else [exact]
+        if rows is not None and ids is not None:
+            rows = np.asarray(rows)[np.isin(rows, ids)]
+        return rows[:TOP_K] if rows is not None and len(rows) else None
+
+    def _direct_results(self, direct, ids, results):
+        """Direct rows, topped up to TOP_K with the occupations nearest to
+        the first of them, so exact codes and titles keep related roles."""
+        short = [i for i, rows in direct.items() if len(rows) < TOP_K]
+        nearest = {}
+        if short:
+            vecs = self.index.vectors([direct[i][0] for i in short])
+            scores, idxs = self.index.search_many(vecs, 2 * TOP_K, ids)
+            for j, i in enumerate(short):
+                nearest[i] = (scores[j], idxs[j])
+
+        for i, rows in direct.items():
+            results[i] = self._results([1.0] * len(rows), rows, "direct")
+            if i in nearest:
+                scores, idxs = nearest[i]
+                keep = (idxs >= 0) & ~np.isin(idxs, rows)
+                fill = TOP_K - len(rows)
+                results[i] += self._results(
+                    scores[keep][:fill], idxs[keep][:fill], "neighbour"
+                )
+
+    def _within(self, within):
+        if within is None:
+            return None
+        ids = self.hierarchy.lookup(str(within))
+        if ids is None:
+            raise ValueError(f"Unknown NCO code prefix '{within}'.")
+        return ids
+
+    def _division(self, division):
+        if division is None:
+            return None
+        ids = self.hierarchy.rows.get(str(division).strip())
+        if ids is None or len(str(division).strip()) != 1:
+            raise ValueError(f"Unknown NCO division '{division}'.")
+        return ids
+
+    def _sector(self, sector):
+        if sector is None:
+            return None
+        if not self.sectors:
+            raise ValueError("The NCO data has no sector column to filter on.")
+        ids = self.sectors.get(" ".join(tokenize(str(sector))))
+        if ids is None:
+            raise ValueError(f"Unknown sector '{sector}'.")
+        return ids
+
+    def _subset(self, within=None, division=None, sector=None):
+        """Sorted rows passing every given filter, or None when unfiltered."""
+        key = (within, division, sector)
+        if key not in self._subsets:
+            ids = None
+            for rows in (self._within(within), self._division(division),
+                         self._sector(sector)):
+                if rows is not None:
+                    ids = np.sort(rows) if ids is None else np.intersect1d(ids, rows)
+            self._subsets[key] = ids
+        return self._subsets[key]
+
+    def match(self, text: str, within=None, division=None, sector=None):
+        return self.match_many(
+            [text], within=within, division=division, sector=sector
+        )[0]
+
+    def match_many(self, texts, batch_size: int = 256, within=None,
+                   division=None, sector=None):
+        """Matches for each text, restricted to rows passing every filter.
+
+        ``within`` is an NCO code prefix, ``division`` the first code digit
+        and ``sector`` a value of the sector column. Filters are applied
+        inside the search, so up to TOP_K hits come back from the subset.
+        Matches under ``min_confidence`` are dropped, so a list may be empty.
+        """
+        ids = self._subset(within, division, sector)
+        results = self._retrieve(texts, batch_size, ids)
+
+        kept = [[m for m in r if m["confidence"] >= self.min_confidence] for r in results]
+        with self._stats_lock:
+            self.stats["queries"] += len(texts)
+            self.stats["filtered"] += sum(len(r) - len(k) for r, k in zip(results, kept))
+            self.stats["empty"] += sum(not k for k in kept)
+        return kept
+
+    def _retrieve(self, texts, batch_size, ids):
+        results = [None] * len(texts)
+        pending, direct = [], {}
+        with span("match.direct"):
+            for i, text in enumerate(texts):
+                rows = self._direct(text, ids)
+                if rows is None:
+                    pending.append(i)
+                else:
+                    direct[i] = rows
+            if direct:
+                self._direct_results(direct, ids, results)
+
+        with self._stats_lock:
+            self.stats["direct"] += len(texts) - len(pending)
+        if not pending:
+            return results
+
+        k = TOP_K if RETRIEVAL_MODE == "dense" else HYBRID_CANDIDATES
+        chunks = {i: self._chunks(texts[i]) for i in pending}
+        short = [i for i in pending if chunks[i] is None]
+        long = [i for i in pending if chunks[i] is not None]
+        queries, candidates = {}, {}
+
+        if short:
+            vecs = self.embedder.encode_queries(
+                [texts[i] for i in short], batch_size=batch_size
+            )
+            scores, idxs = self.index.search_many(vecs, k, ids)
+            for j, i in enumerate(short):
+                queries[i], candidates[i] = vecs[j], (scores[j], idxs[j])
+
+        if long:
+            # Every chunk of every long input goes through one encode and
+            # one multi-query search; chunks are not worth query-caching.
+            vecs = self.embedder.encode(
+                [c for i in long for c in chunks[i]], batch_size=batch_size
+            )
+            _, idxs = self.index.search_many(vecs, k, ids)
+            start = 0
+            with span("match.pool"):
+                for i in long:
+                    end = start + len(chunks[i])
+                    queries[i] = vecs[start:end]
+                    candidates[i] = self._pooled(vecs[start:end], idxs[start:end], k)
+                    start = end
+
+        with span("match.rank"):
+            for i, (scores, idxs) in candidates.items():
+                if RETRIEVAL_MODE == "dense":
+                    results[i] = self._results(scores, idxs)
+                else:
+                    results[i] = self._hybrid(texts[i], queries[i], scores, idxs, ids)
+
+        with self._stats_lock:
+            self.stats["dense"] += len(candidates)
+        return results
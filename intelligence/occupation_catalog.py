@@ -0,0 +1,122 @@
+import csv
+import hashlib
+import json
+import os
+import numpy as np
+
+MAGIC = b"SWCAT001"
+ALIGN = 64
+
+
+def _align(n: int) -> int:
+    return -(-n // ALIGN) * ALIGN
+
+
+class OccupationCatalog:
+    """Read-only columnar view of ``nco.csv`` in one memory-mapped file.
+
+    Codes are an int32 array; every text column is a UTF-8 blob plus int64
+    offsets, so row ``i`` of a column is one slice. The file starts with
+    MAGIC, a little-endian uint64 header length and a JSON header naming
+    the byte range of each array; arrays are 64-byte aligned.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._buf = np.memmap(path, dtype=np.uint8, mode="r")
+        if bytes(self._buf[:8]) != MAGIC:
+            raise ValueError(f"'{path}' is not an occupation catalog.")
+
+        size = int(self._buf[8:16].view("<u8")[0])
+        header = json.loads(bytes(self._buf[16:16 + size]))
+        arrays = {
+            name: self._buf[start:start + nbytes].view(dtype)
+            for name, (dtype, start, nbytes) in header["arrays"].items()
+        }
+
+        self.codes = arrays.pop("nco_code")
+        self.text_columns = tuple(header["text_columns"])
+        self._text = {
+            name: (arrays[name + ".offsets"], arrays[name + ".data"])
+            for name in self.text_columns
+        }
+
+    @classmethod
+    def open(cls, csv_path: str, directory: str):
+        """Catalog for ``csv_path``, rebuilt whenever the CSV content changes."""
+        h = hashlib.sha1()
+        with open(csv_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        stem = os.path.splitext(os.path.basename(csv_path))[0]
+        path = os.path.join(directory, f"{stem}-{h.hexdigest()[:16]}.cat")
+
+        if not os.path.exists(path):
+            cls.build(csv_path, path)
+        return cls(path)
+
+    @staticmethod
+    def build(csv_path: str, path: str):
+        # Some NCO descriptions run past the csv module's 128 KiB field limit.
+        csv.field_size_limit(max(csv.field_size_limit(), os.path.getsize(csv_path)))
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+            fields = reader.fieldnames or []
+
+        arrays = {"nco_code": np.array(
+            [int(r["nco_code"]) for r in rows], dtype="<i4"
+        )}
+        text_columns = [c for c in fields if c != "nco_code"]
+        for name in text_columns:
+            encoded = [(r[name] or "").encode("utf-8") for r in rows]
+            offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+            np.cumsum([len(b) for b in encoded], out=offsets[1:])
+            arrays[name + ".offsets"] = offsets
+            arrays[name + ".data"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+        # Array offsets depend on the header size and vice versa; grow the
+        # reserved header space until the header fits.
+        reserve = ALIGN
+        while True:
+            layout, cursor = {}, reserve
+            for name, arr in arrays.items():
+                layout[name] = (arr.dtype.str, cursor, arr.nbytes)
+                cursor = _align(cursor + arr.nbytes)
+            header = json.dumps({
+                "rows": len(rows), "text_columns": text_columns, "arrays": layout
+            }).encode("utf-8")
+            if 16 + len(header) <= reserve:
+                break
+            reserve = _align(16 + len(header) + 32)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC)
+            f.write(np.uint64(len(header)).astype("<u8").tobytes())
+            f.write(header)
+            for name, arr in arrays.items():
+                f.seek(layout[name][1])
+                f.write(arr.tobytes())
+            f.truncate(cursor)
+        os.replace(tmp, path)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, column: str):
+        return column == "nco_code" or column in self._text
+
+    def text(self, column: str, row: int) -> str:
+        offsets, data = self._text[column]
+        return bytes(data[offsets[row]:offsets[row + 1]]).decode("utf-8")
+
+    def column(self, column: str):
+        """Every value of a text column, decoded in one pass."""
+        offsets, data = self._text[column]
+        blob = bytes(data)
+        return [
+            blob[s:e].decode("utf-8")
+            for s, e in zip(offsets[:-1].tolist(), offsets[1:].tolist())
+        ]
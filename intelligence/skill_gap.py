@@ -1,12 +1,74 @@
-import pandas as pd
+import numpy as np
 from utils.paths import resolve
+from config.settings import SKILLS_PATH
 
 class SkillGapEngine:
-    def __init__(self):
-        self.df = pd.read_csv(resolve("data/skills.csv"))
+    def __init__(self, path=SKILLS_PATH):
+        import pandas as pd
+        df = pd.read_csv(resolve(path))
+
+        # Skill ids are assigned in sorted name order, so sorting ids
+        # sorts names as well. Blank skill cells get id -1 and are dropped.
+        ids, names = pd.factorize(df["skill"], sort=True)
+        self.skill_names = tuple(names)
+        self.skill_ids = {name: i for i, name in enumerate(self.skill_names)}
+
+        codes = df["nco_code"].to_numpy()
+        codes, ids = codes[ids >= 0], ids[ids >= 0]
+        order = np.lexsort((ids, codes))
+        codes, ids = codes[order], ids[order]
+        unique = np.r_[
+            len(codes) > 0, (codes[1:] != codes[:-1]) | (ids[1:] != ids[:-1])
+        ]
+        codes, ids = codes[unique], ids[unique]
+
+        # CSR of sorted skill ids per code, for gap_many.
+        starts = np.flatnonzero(np.r_[len(codes) > 0, codes[1:] != codes[:-1]])
+        self._codes = codes[starts].astype(np.int64)
+        self._indptr = np.r_[starts, len(codes)]
+        self._skills = ids
+        self._names = np.array(self.skill_names, dtype=object)
+
+        self.required = {
+            int(code): frozenset(ids[s:e].tolist())
+            for code, s, e in zip(self._codes, self._indptr[:-1], self._indptr[1:])
+        }
 
     def gap(self, user_skills, nco_code):
-        required = set(
-            self.df[self.df.nco_code == nco_code]["skill"]
-        )
-        return sorted(required - set(user_skills))
+        required = self.required.get(nco_code)
+        if not required:
+            return []
+
+        have = {self.skill_ids.get(s) for s in user_skills}
+        return [self.skill_names[i] for i in sorted(required - have)]
+
+    def gap_many(self, user_skills_list, nco_codes):
+        """``gap`` for many (skills, code) pairs in one vectorised pass."""
+        codes = np.asarray(nco_codes, dtype=np.int64)
+        if not len(codes) or not len(self._codes):
+            return [[] for _ in codes]
+
+        pos = np.minimum(np.searchsorted(self._codes, codes), len(self._codes) - 1)
+        found = self._codes[pos] == codes
+        starts = np.where(found, self._indptr[pos], 0)
+        counts = np.where(found, self._indptr[pos + 1] - starts, 0)
+
+        # Required skills of every pair, concatenated, keyed by pair number.
+        ends = np.cumsum(counts)
+        flat = self._skills[np.repeat(starts - (ends - counts), counts)
+                            + np.arange(ends[-1] if len(ends) else 0)]
+        pair = np.repeat(np.arange(len(codes)), counts)
+
+        n = len(self.skill_names)
+        have = [
+            i * n + self.skill_ids[s]
+            for i, skills in enumerate(user_skills_list)
+            for s in skills if s in self.skill_ids
+        ]
+        missing = ~np.isin(pair * n + flat, np.array(have, dtype=np.int64))
+
+        names = self._names[flat]
+        return [
+            names[s:e][missing[s:e]].tolist()
+            for s, e in zip(ends - counts, ends)
+        ]
@@ -11,11 +11,25 @@ Version: 2.0 (Production - Two-Column Layout)
 import pdfplumber
 import re
 import csv
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import numpy as np
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
 
+# Pages before this one are cover and front matter
+FIRST_CONTENT_PAGE = 5
+
+
 @dataclass
 class Occupation:
     """Represents a single NCO occupation record."""
@@ -37,6 +51,102 @@ class Occupation:
         )
 
 
+class PageWordCache:
+    """
+    Per-page cache of raw ``extract_words`` output, keyed by PDF hash.
+    
+    Each page is stored as a small columnar ``.npz`` (x0, top and an
+    offset-encoded UTF-8 text blob). Files are written atomically, so the
+    set of cached pages doubles as the checkpoint of an interrupted run.
+    Only pdfplumber's output is cached; the column and line rules are
+    replayed on every run.
+    """
+    
+    def __init__(self, cache_dir: str, pdf_hash: str):
+        """
+        Args:
+            cache_dir: Root directory for cached pages
+            pdf_hash: Content hash of the PDF (see ``file_hash``)
+        """
+        self.dir = Path(cache_dir) / pdf_hash
+        self.dir.mkdir(parents=True, exist_ok=True)
+    
+    @staticmethod
+    def file_hash(pdf_path: Path) -> str:
+        """Returns the SHA-1 of the PDF contents."""
+        h = hashlib.sha1()
+        with open(pdf_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        return h.hexdigest()
+    
+    def _write_atomic(self, path: Path, write):
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'wb') as f:
+            write(f)
+        os.replace(tmp, path)
+    
+    def page_count(self) -> Optional[int]:
+        manifest = self.dir / 'manifest.json'
+        if not manifest.exists():
+            return None
+        with open(manifest, encoding='utf-8') as f:
+            return json.load(f)['page_count']
+    
+    def store_page_count(self, page_count: int):
+        self._write_atomic(
+            self.dir / 'manifest.json',
+            lambda f: f.write(json.dumps({'page_count': page_count}).encode('utf-8'))
+        )
+    
+    def load(self, page_num: int) -> Optional[Tuple[float, List[Dict]]]:
+        """
+        Loads the cached words of a page.
+        
+        Args:
+            page_num: 1-based page number
+            
+        Returns:
+            (page_width, words) or None when the page is not cached
+        """
+        path = self.dir / f'page_{page_num:05d}.npz'
+        if not path.exists():
+            return None
+        
+        with np.load(path) as data:
+            blob = data['text'].tobytes()
+            offsets = data['offsets']
+            words = [
+                {'x0': float(x0), 'top': float(top),
+                 'text': blob[offsets[i]:offsets[i + 1]].decode('utf-8')}
+                for i, (x0, top) in enumerate(zip(data['x0'], data['top']))
+            ]
+            return float(data['width']), words
+    
+    def store(self, page_num: int, width: float, words: List[Dict]):
+        """
+        Stores the words of a page.
+        
+        Positions stay float64 so ``_words_to_lines`` rounds them exactly as
+        it does for live pdfplumber output.
+        """
+        encoded = [w['text'].encode('utf-8') for w in words]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        
+        self._write_atomic(
+            self.dir / f'page_{page_num:05d}.npz',
+            lambda f: np.savez(
+                f,
+                width=np.float64(width),
+                x0=np.array([w['x0'] for w in words], dtype=np.float64),
+                top=np.array([w['top'] for w in words], dtype=np.float64),
+                text=np.frombuffer(b''.join(encoded), dtype=np.uint8),
+                offsets=offsets,
+            )
+        )
+
+
 class NCOExtractor:
     """
     Extracts occupation data from NCO-2015 PDF files with two-column layout.
@@ -66,14 +176,19 @@ class NCOExtractor:
         r'sub-group:?\s*\d{3}',
     ]
     
-    def __init__(self, pdf_paths: List[str]):
+    def __init__(self, pdf_paths: List[str], workers: int = 1,
+                 cache_dir: Optional[str] = None):
         """
         Initialize extractor with PDF file paths.
         
         Args:
             pdf_paths: List of paths to NCO-2015 PDF files
+            workers: Number of processes used for page extraction
+            cache_dir: Directory for the per-page word cache (None disables it)
         """
         self.pdf_paths = [Path(p) for p in pdf_paths]
+        self.workers = max(1, workers)
+        self.cache_dir = cache_dir
         self.occupations: List[Occupation] = []
         
     def is_valid_nco_code(self, text: str) -> bool:
@@ -157,6 +272,14 @@ class NCOExtractor:
             
         return False
     
+    def page_words(self, page) -> List[Dict]:
+        """Runs pdfplumber's word extraction on a page."""
+        return page.extract_words(
+            x_tolerance=3,
+            y_tolerance=3,
+            keep_blank_chars=False
+        )
+    
     def split_into_columns(self, page) -> Tuple[List[str], List[str]]:
         """
         Splits a two-column page into left and right columns.
@@ -167,17 +290,24 @@ class NCOExtractor:
         Returns:
             Tuple of (left_column_lines, right_column_lines)
         """
-        words = page.extract_words(
-            x_tolerance=3,
-            y_tolerance=3,
-            keep_blank_chars=False
-        )
+        return self.split_words_into_columns(self.page_words(page), page.width)
+    
+    def split_words_into_columns(self, words: List[Dict],
+                                 page_width: float) -> Tuple[List[str], List[str]]:
+        """
+        Splits extracted words of a two-column page into column lines.
         
+        Args:
+            words: Word dictionaries with x0, top and text
+            page_width: Width of the page
+            
+        Returns:
+            Tuple of (left_column_lines, right_column_lines)
+        """
         if not words:
             return [], []
         
         # Determine column boundary (middle of page)
-        page_width = page.width
         mid_x = page_width / 2
         
         # Separate words into left and right columns
@@ -328,38 +458,201 @@ class NCOExtractor:
         
         return occupations
     
-    def extract_from_pdf(self, pdf_path: Path) -> List[Occupation]:
+    def extract_from_page(self, page) -> List[Occupation]:
         """
-        Extracts all occupations from a single PDF file.
+        Extracts occupations from one page, left column first.
         
         Args:
-            pdf_path: Path to PDF file
+            page: pdfplumber page object
             
         Returns:
             List of extracted Occupation objects
         """
-        all_occupations = []
+        return self.extract_from_words(self.page_words(page), page.width)
+    
+    def extract_from_words(self, words: List[Dict], page_width: float) -> List[Occupation]:
+        """Extracts occupations from the words of one page, left column first."""
+        left_lines, right_lines = self.split_words_into_columns(words, page_width)
         
-        with pdfplumber.open(pdf_path) as pdf:
-            for page_num, page in enumerate(pdf.pages, 1):
-                # Skip cover pages (usually first 5-10 pages)
-                if page_num < 5:
+        return (
+            self.extract_occupations_from_column(left_lines) +
+            self.extract_occupations_from_column(right_lines)
+        )
+    
+    def iter_page_words(self, pdf_path: Path, start: int, end: int,
+                        pdf_hash: Optional[str] = None):
+        """
+        Yields (page_num, page_width, words) for pages ``start`` to ``end - 1``.
+        
+        Cached pages are replayed without touching the PDF; the PDF is only
+        opened for pages missing from the cache, which are then stored.
+        
+        Args:
+            pdf_path: Path to PDF file
+            start: First page number (1-based)
+            end: Page number to stop before
+            pdf_hash: Precomputed ``PageWordCache.file_hash`` of the PDF
+        """
+        cache = None
+        if self.cache_dir:
+            cache = PageWordCache(
+                self.cache_dir, pdf_hash or PageWordCache.file_hash(pdf_path)
+            )
+        
+        pdf = None
+        try:
+            for page_num in range(start, end):
+                cached = cache.load(page_num) if cache else None
+                if cached:
+                    yield (page_num,) + cached
                     continue
                 
-                # Split page into columns
-                left_lines, right_lines = self.split_into_columns(page)
-                
-                # Extract from left column first, then right column
-                left_occs = self.extract_occupations_from_column(left_lines)
-                right_occs = self.extract_occupations_from_column(right_lines)
+                if pdf is None:
+                    pdf = pdfplumber.open(pdf_path)
+                page = pdf.pages[page_num - 1]
+                words = [
+                    {'x0': w['x0'], 'top': w['top'], 'text': w['text']}
+                    for w in self.page_words(page)
+                ]
+                if cache:
+                    cache.store(page_num, page.width, words)
+                yield page_num, page.width, words
+        finally:
+            if pdf is not None:
+                pdf.close()
+    
+    def extract_page_range(self, pdf_path: Path, start: int, end: int,
+                           pdf_hash: Optional[str] = None) -> List[Occupation]:
+        """
+        Extracts occupations from pages ``start`` to ``end - 1`` (1-based).
+        
+        Opens its own pdfplumber handle, so it can run in a worker process.
+        
+        Args:
+            pdf_path: Path to PDF file
+            start: First page number to process
+            end: Page number to stop before
+            pdf_hash: Precomputed ``PageWordCache.file_hash`` of the PDF
+            
+        Returns:
+            List of extracted Occupation objects in page order
+        """
+        occupations = []
+        
+        for _, width, words in self.iter_page_words(pdf_path, start, end, pdf_hash):
+            occupations.extend(self.extract_from_words(words, width))
+        
+        return occupations
+    
+    def page_count(self, pdf_path: Path, pdf_hash: Optional[str] = None) -> int:
+        """Returns the number of pages, from the cache manifest when available."""
+        cache = PageWordCache(self.cache_dir, pdf_hash) if self.cache_dir else None
+        
+        if cache and cache.page_count() is not None:
+            return cache.page_count()
+        
+        with pdfplumber.open(pdf_path) as pdf:
+            page_count = len(pdf.pages)
+        
+        if cache:
+            cache.store_page_count(page_count)
+        return page_count
+    
+    def page_shards(self, page_count: int) -> List[Tuple[int, int]]:
+        """
+        Splits the content pages into contiguous ranges for the worker pool.
+        
+        Several shards per worker keep the pool busy when some page ranges
+        are denser than others.
+        
+        Args:
+            page_count: Total number of pages in the PDF
+            
+        Returns:
+            List of (start, end) page ranges in page order
+        """
+        first = FIRST_CONTENT_PAGE
+        if page_count < first:
+            return []
+        
+        pages = page_count - first + 1
+        size = max(1, -(-pages // (self.workers * 4)))
+        
+        return [
+            (start, min(start + size, page_count + 1))
+            for start in range(first, page_count + 1, size)
+        ]
+    
+    def iter_page_batches(self, pdf_path: Path) -> Iterator[List[Occupation]]:
+        """
+        Yields the occupations of a PDF one page (or worker shard) at a time.
+        
+        With ``workers > 1`` the page shards run in a process pool with at
+        most two shards per worker in flight; batches are yielded in page
+        order so deduplication stays deterministic and memory stays bounded.
+        
+        Args:
+            pdf_path: Path to PDF file
+            
+        Yields:
+            Lists of Occupation objects in page order
+        """
+        pdf_hash = PageWordCache.file_hash(pdf_path) if self.cache_dir else None
+        page_count = self.page_count(pdf_path, pdf_hash)
+        
+        shards = self.page_shards(page_count)
+        progress = ExtractionProgress(shards[-1][1] - shards[0][0] if shards else 0)
+        
+        if self.workers == 1:
+            pages = self.iter_page_words(
+                pdf_path, FIRST_CONTENT_PAGE, page_count + 1, pdf_hash
+            )
+            for _, width, words in pages:
+                occupations = self.extract_from_words(words, width)
+                progress.update(1, len(occupations))
+                yield occupations
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                pending = deque()
+                shard_iter = iter(shards)
                 
-                all_occupations.extend(left_occs)
-                all_occupations.extend(right_occs)
+                for start, end in itertools.islice(shard_iter, self.workers * 2):
+                    pending.append((end - start, pool.submit(
+                        _extract_page_range,
+                        (type(self), self.cache_dir, pdf_path, start, end, pdf_hash)
+                    )))
                 
-                if page_num % 50 == 0:
-                    print(f"  Processed {page_num} pages, found {len(all_occupations)} occupations so far...")
+                while pending:
+                    pages, future = pending.popleft()
+                    occupations = future.result()
+                    
+                    for start, end in itertools.islice(shard_iter, 1):
+                        pending.append((end - start, pool.submit(
+                            _extract_page_range,
+                            (type(self), self.cache_dir, pdf_path, start, end, pdf_hash)
+                        )))
+                    
+                    progress.update(pages, len(occupations))
+                    yield occupations
+        
+        progress.finish()
+    
+    def iter_pdf(self, pdf_path: Path) -> Iterator[Occupation]:
+        """Lazily yields the occupations of a single PDF file in page order."""
+        for occupations in self.iter_page_batches(pdf_path):
+            yield from occupations
+    
+    def extract_from_pdf(self, pdf_path: Path) -> List[Occupation]:
+        """
+        Extracts all occupations from a single PDF file.
         
-        return all_occupations
+        Args:
+            pdf_path: Path to PDF file
+            
+        Returns:
+            List of extracted Occupation objects
+        """
+        return list(self.iter_pdf(pdf_path))
     
     def extract_all(self) -> List[Occupation]:
         """Extracts occupations from all configured PDF files."""
@@ -387,6 +680,28 @@ class NCOExtractor:
         self.occupations = unique_occupations
         return unique_occupations
     
+    def iter_unique_batches(self) -> Iterator[List[Occupation]]:
+        """
+        Streams deduplicated occupations from all PDFs, one page at a time.
+        
+        Only the set of seen NCO codes is kept in memory; the first
+        occurrence of a code wins, as in ``deduplicate``.
+        
+        Yields:
+            Lists of previously unseen Occupation objects
+        """
+        seen_codes = set()
+        
+        for pdf_path in self.pdf_paths:
+            print(f"\nProcessing: {pdf_path.name}")
+            for occupations in self.iter_page_batches(pdf_path):
+                unique = []
+                for occ in occupations:
+                    if occ.nco_code not in seen_codes:
+                        seen_codes.add(occ.nco_code)
+                        unique.append(occ)
+                yield unique
+    
     def clean_text(self, text: str) -> str:
         """Cleans extracted text by normalizing whitespace."""
         # Normalize whitespace
@@ -420,6 +735,94 @@ class NCOExtractor:
         print(f"✓ Exported {len(self.occupations)} occupations to: {output_path}")
         print('='*80)
     
+    def stream_to_csv(self, output_path: str) -> Dict[str, int]:
+        """
+        Streams deduplicated occupations straight to a CSV file.
+        
+        The file is flushed after every page, so consumers such as
+        ``NCOMatcher`` can read the rows written so far while extraction
+        is still running.
+        
+        Args:
+            output_path: Destination CSV path
+            
+        Returns:
+            Number of occupations per division
+        """
+        divisions: Dict[str, int] = {}
+        
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['nco_code', 'title', 'description'])
+            f.flush()
+            
+            for occupations in self.iter_unique_batches():
+                for occ in occupations:
+                    writer.writerow([
+                        occ.nco_code,
+                        self.clean_text(occ.title),
+                        self.clean_text(occ.description)
+                    ])
+                    divisions[occ.nco_code[0]] = divisions.get(occ.nco_code[0], 0) + 1
+                if occupations:
+                    f.flush()
+        
+        self._print_stream_summary(output_path, divisions)
+        return divisions
+    
+    def stream_to_parquet(self, output_path: str, row_group_size: int = 1000) -> Dict[str, int]:
+        """
+        Streams deduplicated occupations to a Parquet file in row groups.
+        
+        Memory is bounded by ``row_group_size``. Unlike the CSV stream, the
+        file only becomes readable once the footer is written at the end.
+        
+        Args:
+            output_path: Destination Parquet path
+            row_group_size: Rows buffered per row group
+            
+        Returns:
+            Number of occupations per division
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        schema = pa.schema([
+            ('nco_code', pa.string()),
+            ('title', pa.string()),
+            ('description', pa.string()),
+        ])
+        divisions: Dict[str, int] = {}
+        buffer: List[Occupation] = []
+        
+        def flush(writer):
+            writer.write_table(pa.table({
+                'nco_code': [o.nco_code for o in buffer],
+                'title': [self.clean_text(o.title) for o in buffer],
+                'description': [self.clean_text(o.description) for o in buffer],
+            }, schema=schema))
+            buffer.clear()
+        
+        with pq.ParquetWriter(output_path, schema) as writer:
+            for occupations in self.iter_unique_batches():
+                for occ in occupations:
+                    divisions[occ.nco_code[0]] = divisions.get(occ.nco_code[0], 0) + 1
+                buffer.extend(occupations)
+                if len(buffer) >= row_group_size:
+                    flush(writer)
+            if buffer:
+                flush(writer)
+        
+        self._print_stream_summary(output_path, divisions)
+        return divisions
+    
+    def _print_stream_summary(self, output_path: str, divisions: Dict[str, int]):
+        print(f"\n{'='*80}")
+        print(f"✓ Streamed {sum(divisions.values())} occupations to: {output_path}")
+        for div in sorted(divisions.keys()):
+            print(f"  Division {div}: {divisions[div]:4d} occupations")
+        print('='*80)
+    
     def print_statistics(self):
         """Prints extraction statistics for validation."""
         print("\n" + "="*80)
@@ -459,16 +862,87 @@ class NCOExtractor:
         print("="*80)
 
 
+def _extract_page_range(args) -> List[Occupation]:
+    """Process pool entry point: builds a fresh extractor per shard."""
+    extractor_cls, cache_dir, pdf_path, start, end, pdf_hash = args
+    extractor = extractor_cls([], cache_dir=cache_dir)
+    return extractor.extract_page_range(pdf_path, start, end, pdf_hash)
+
+
+class ExtractionProgress:
+    """Reports pages/sec and occupations found while a PDF is processed."""
+    
+    def __init__(self, total_pages: int, interval: float = 2.0):
+        self.total_pages = total_pages
+        self.interval = interval
+        self.pages = 0
+        self.occupations = 0
+        self.started = time.perf_counter()
+        self.last_report = self.started
+        self.reported_pages = 0
+    
+    def update(self, pages: int, occupations: int):
+        """Records a finished shard and prints a report at most every interval."""
+        self.pages += pages
+        self.occupations += occupations
+        
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            self.report(now)
+    
+    def report(self, now: float):
+        self.reported_pages = self.pages
+        elapsed = max(now - self.started, 1e-9)
+        rate = self.pages / elapsed
+        eta = (self.total_pages - self.pages) / rate if rate else 0.0
+        print(
+            f"  {self.pages}/{self.total_pages} pages, "
+            f"{self.occupations} occupations, "
+            f"{rate:.1f} pages/s, ETA {eta:.0f}s"
+        )
+        sys.stdout.flush()
+    
+    def finish(self):
+        if self.reported_pages != self.pages or not self.pages:
+            self.report(time.perf_counter())
+
+
 def main():
     """Main execution function."""
     
+    parser = argparse.ArgumentParser(description="NCO-2015 occupation extractor")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="number of processes used to extract pages (default: 1)"
+    )
+    parser.add_argument(
+        "--cache-dir", default="cache/nco_pages",
+        help="per-page word cache; reruns and resumed runs replay it "
+             "(default: cache/nco_pages)"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="always re-extract words from the PDFs"
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="write deduplicated occupations page by page with bounded memory"
+    )
+    parser.add_argument(
+        "--output", default="data/nco.csv",
+        help="output path; a .parquet suffix writes Parquet in --stream mode "
+             "(default: data/nco.csv)"
+    )
+    args = parser.parse_args()
+    
     # CONFIGURATION: Update these paths
     PDF_FILES = [
         "data/raw/NCO_2015_Vol_II_Part1.pdf",
         "data/raw/NCO_2015_Vol_II_Part2.pdf"
     ]
     
-    OUTPUT_CSV = "data/nco.csv"
+    OUTPUT_CSV = args.output
     
     print("NCO-2015 Occupation Data Extractor v2.0")
     print("Two-Column Layout Handler")
@@ -482,7 +956,19 @@ def main():
             return
     
     # Extract occupations
-    extractor = NCOExtractor(PDF_FILES)
+    extractor = NCOExtractor(
+        PDF_FILES,
+        workers=args.workers,
+        cache_dir=None if args.no_cache else args.cache_dir
+    )
+    
+    if args.stream:
+        if OUTPUT_CSV.endswith('.parquet'):
+            extractor.stream_to_parquet(OUTPUT_CSV)
+        else:
+            extractor.stream_to_csv(OUTPUT_CSV)
+        return
+    
     extractor.extract_all()
     
     # Deduplicate
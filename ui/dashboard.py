@@ -5,7 +5,9 @@ import os
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(BASE_DIR)
 
-from app.main import SkillWeave
+from app.registry import get_engine, warm_up
+from core.tracing import serve_metrics
+from config.settings import METRICS_PORT, SERVER_HOST
 
 st.set_page_config(
     page_title="SkillWeave",
@@ -13,7 +15,10 @@ st.set_page_config(
     layout="wide"
 )
 
-engine = SkillWeave()
+engine = get_engine()
+warm_up()
+if METRICS_PORT:
+    serve_metrics(SERVER_HOST, METRICS_PORT)
 
 st.markdown("""
 # 🧠 SkillWeave  
@@ -40,6 +45,9 @@ with col2:
 
 analyze = st.button("🚀 Analyze Career Profile", use_container_width=True)
 
+if not engine.ready:
+    st.caption("Loading models in the background…")
+
 # ---------- Output ----------
 if analyze:
     if not text.strip():